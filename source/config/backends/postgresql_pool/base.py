@@ -0,0 +1,27 @@
+import functools
+
+from django.db.backends.postgresql import base
+
+from .pool import ConnectionPool, get_pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Бэкенд PostgreSQL, который берет соединения из пула внутри процесса
+    и возвращает их в пул вместо закрытия.
+    Параметры пула задаются ключом POOL в настройках базы данных.
+    """
+
+    @property
+    def pool(self) -> ConnectionPool:
+        return get_pool(self.alias, self.settings_dict.get('POOL', {}))
+
+    def get_new_connection(self, conn_params):
+        return self.pool.getconn(
+            functools.partial(super().get_new_connection, conn_params)
+        )
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.putconn(self.connection)
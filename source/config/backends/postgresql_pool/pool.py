@@ -0,0 +1,191 @@
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable
+
+from psycopg2 import extensions
+
+
+class PoolTimeout(Exception):
+    """
+    Свободное соединение не освободилось за отведенное время.
+    """
+
+
+@dataclass
+class PoolMetrics:
+    # Сколько раз соединение выдавалось из пула.
+    checkouts: int = 0
+    # Суммарное и максимальное время ожидания свободного соединения в секундах.
+    wait_seconds_total: float = 0
+    wait_seconds_max: float = 0
+    # Сколько раз соединение не удалось получить за TIMEOUT.
+    timeouts: int = 0
+    # Сколько физических соединений открыто за время жизни пула.
+    connects: int = 0
+    # Сколько соединений выброшено как неработоспособные и заменено новыми.
+    reconnects: int = 0
+
+
+@dataclass
+class IdleConnection:
+    connection: extensions.connection
+    released_at: float = field(default_factory=time.monotonic)
+
+
+class ConnectionPool:
+    """
+    Пул соединений psycopg2 внутри процесса, общий для всех его потоков.
+    Соединение открывается один раз, поэтому установка search_path и другие параметры
+    старта соединения выполняются один раз на соединение, а не на каждый запрос.
+    Если все max_size соединений заняты, поток ждет освобождения не дольше timeout секунд.
+    Соединение, простоявшее дольше health_check_after секунд, проверяется перед выдачей.
+    """
+
+    def __init__(self, max_size: int, timeout: float, health_check_after: float):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_after = health_check_after
+        self.metrics = PoolMetrics()
+        self.idle: list[IdleConnection] = []
+        self.size = 0
+        self.condition = threading.Condition()
+
+    def getconn(self, connect: Callable[[], extensions.connection]):
+        """
+        Выдает свободное соединение или открывает новое функцией connect, если пул не заполнен.
+        """
+        idle = self.acquire()
+        if idle is not None and self.is_usable(idle):
+            return idle.connection
+        if idle is not None:
+            self.increment('reconnects')
+            close_quietly(idle.connection)
+
+        try:
+            connection = connect()
+        except Exception:
+            self.release_slot()
+            raise
+        self.increment('connects')
+        return connection
+
+    def putconn(self, connection: extensions.connection):
+        """
+        Возвращает соединение в пул. Незавершенная транзакция откатывается,
+        а соединение в неизвестном состоянии закрывается и освобождает место в пуле.
+        """
+        if not connection.closed and connection.info.transaction_status in {
+            extensions.TRANSACTION_STATUS_INTRANS,
+            extensions.TRANSACTION_STATUS_INERROR,
+        }:
+            try:
+                connection.rollback()
+            except extensions.Error:
+                close_quietly(connection)
+
+        if (
+            connection.closed
+            or connection.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE
+        ):
+            self.increment('reconnects')
+            close_quietly(connection)
+            self.release_slot()
+            return
+
+        with self.condition:
+            self.idle.append(IdleConnection(connection))
+            self.condition.notify()
+
+    def acquire(self) -> IdleConnection | None:
+        """
+        Занимает место в пуле. Возвращает свободное соединение
+        или None, если нужно открыть новое.
+        """
+        started = time.monotonic()
+        with self.condition:
+            while not self.idle and self.size >= self.max_size:
+                remaining = self.timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self.metrics.timeouts += 1
+                    raise PoolTimeout(
+                        f'No connection available within {self.timeout} seconds.'
+                    )
+                self.condition.wait(remaining)
+
+            waited = time.monotonic() - started
+            self.metrics.checkouts += 1
+            self.metrics.wait_seconds_total += waited
+            self.metrics.wait_seconds_max = max(self.metrics.wait_seconds_max, waited)
+            if self.idle:
+                return self.idle.pop()
+            self.size += 1
+            return None
+
+    def increment(self, metric: str):
+        with self.condition:
+            setattr(self.metrics, metric, getattr(self.metrics, metric) + 1)
+
+    def release_slot(self):
+        with self.condition:
+            self.size -= 1
+            self.condition.notify()
+
+    def is_usable(self, idle: IdleConnection) -> bool:
+        if idle.connection.closed:
+            return False
+        if time.monotonic() - idle.released_at < self.health_check_after:
+            return True
+        return ping(idle.connection)
+
+    def get_stats(self) -> dict:
+        with self.condition:
+            return {
+                **asdict(self.metrics),
+                'size': self.size,
+                'idle': len(self.idle),
+                'in_use': self.size - len(self.idle),
+                'max_size': self.max_size,
+            }
+
+
+def ping(connection: extensions.connection) -> bool:
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except extensions.Error:
+        return False
+    return True
+
+
+def close_quietly(connection: extensions.connection):
+    try:
+        connection.close()
+    except extensions.Error:
+        return
+
+
+_pools: dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias: str, options: dict) -> ConnectionPool:
+    """
+    Возвращает пул соединений базы данных alias, создавая его при первом обращении.
+    """
+    with _pools_lock:
+        if alias not in _pools:
+            _pools[alias] = ConnectionPool(
+                max_size=options.get('MAX_SIZE', 8),
+                timeout=options.get('TIMEOUT', 10),
+                health_check_after=options.get('HEALTH_CHECK_AFTER', 30),
+            )
+        return _pools[alias]
+
+
+def get_pool_stats() -> dict[str, dict]:
+    """
+    Возвращает метрики пулов всех баз данных текущего процесса.
+    """
+    with _pools_lock:
+        return {alias: pool.get_stats() for alias, pool in _pools.items()}
@@ -0,0 +1,58 @@
+import os
+
+# Способ построения запроса к фильмам в API:
+# 'subquery' - коррелированные подзапросы на каждую строку,
+# 'join' - один проход LEFT JOIN по связующим таблицам с группировкой по фильму,
+# 'read_model' - чтение из витрины film_work_read_model (обновляется командой refresh_read_model).
+MOVIES_API_QUERY_ENGINE = os.environ.get('MOVIES_API_QUERY_ENGINE', 'subquery')
+
+# Сколько секунд хранится точное количество фильмов для набора фильтров.
+MOVIES_API_COUNT_CACHE_TIMEOUT = int(
+    os.environ.get('MOVIES_API_COUNT_CACHE_TIMEOUT', 300)
+)
+# Начиная с какого размера таблицы film_work (по оценке pg_class.reltuples)
+# вместо COUNT(*) отдается оценка планировщика PostgreSQL.
+MOVIES_API_COUNT_ESTIMATE_THRESHOLD = int(
+    os.environ.get('MOVIES_API_COUNT_ESTIMATE_THRESHOLD', 1_000_000)
+)
+
+# Размер страницы ленты изменений /api/v1/movies/changes/.
+MOVIES_CHANGES_PAGE_SIZE = int(os.environ.get('MOVIES_CHANGES_PAGE_SIZE', 500))
+# Сколько секунд изменение выдерживается перед выдачей в ленту,
+# чтобы транзакция, записавшая его, успела зафиксироваться.
+MOVIES_CHANGES_SAFETY_LAG = int(os.environ.get('MOVIES_CHANGES_SAFETY_LAG', 5))
+
+# Использовать асинхронные представления API. Включается при запуске под ASGI-сервером
+# (gunicorn с воркерами uvicorn), под uWSGI асинхронные представления выполнялись бы
+# в отдельном цикле событий на каждый запрос без выигрыша в конкурентности.
+MOVIES_API_ASYNC = os.environ.get('MOVIES_API_ASYNC', 'False') == 'True'
+
+# Кодировщик JSON ответов API: 'orjson', 'msgspec', 'stdlib'
+# или 'auto' - самый быстрый из установленных (orjson и msgspec необязательны).
+MOVIES_API_JSON_ENCODER = os.environ.get('MOVIES_API_JSON_ENCODER', 'auto')
+# Собирать JSON страниц списка и карточек фильмов в PostgreSQL (json_agg, row_to_json)
+# и отдавать его без разбора в Python. Страницы по курсору всегда собираются в Python,
+# так как курсоры строятся по значениям записей.
+MOVIES_API_DB_JSON = os.environ.get('MOVIES_API_DB_JSON', 'False') == 'True'
+
+# Сколько фильмов можно запросить одним запросом /api/v1/movies/?ids=...
+MOVIES_API_BATCH_MAX_IDS = int(os.environ.get('MOVIES_API_BATCH_MAX_IDS', 100))
+
+# Сколько секунд общие кэши (nginx proxy_cache, CDN) могут отдавать ответ API без обращения
+# к приложению (s-maxage) и сколько еще секунд отдавать устаревший ответ, пока он обновляется.
+# Время жизни микрокэша nginx задается в nginx_configs/site.conf (proxy_cache_valid).
+MOVIES_API_CACHE_MAX_AGE = int(os.environ.get('MOVIES_API_CACHE_MAX_AGE', 5))
+MOVIES_API_CACHE_STALE = int(os.environ.get('MOVIES_API_CACHE_STALE', 30))
+# Адрес nginx, через который после изменения фильмов обновляются их закэшированные ответы
+# (например, http://nginx). Пустое значение отключает обновление.
+MOVIES_API_CACHE_PURGE_URL = os.environ.get('MOVIES_API_CACHE_PURGE_URL', '')
+# Заголовок Host запросов обновления: должен совпадать с адресом, по которому API
+# запрашивают клиенты, и входить в ALLOWED_HOSTS.
+MOVIES_API_CACHE_PURGE_HOST = os.environ.get('MOVIES_API_CACHE_PURGE_HOST', 'localhost')
+MOVIES_API_CACHE_PURGE_TIMEOUT = float(
+    os.environ.get('MOVIES_API_CACHE_PURGE_TIMEOUT', 1)
+)
+# Сколько адресов обновляется после одного изменения, при превышении - только первая страница списка.
+MOVIES_API_CACHE_PURGE_MAX_PATHS = int(
+    os.environ.get('MOVIES_API_CACHE_PURGE_MAX_PATHS', 20)
+)
@@ -0,0 +1,25 @@
+import os
+
+# Для нескольких процессов uWSGI нужен общий кэш (например, django.core.cache.backends.redis.RedisCache),
+# иначе сброс кэша по сигналам моделей затронет только процесс, выполнивший запись.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    },
+}
+
+# Кэш сериализованных карточек фильмов. LocMemCache вытесняет давно не запрошенные записи
+# при превышении MAX_ENTRIES, а TIMEOUT ограничивает время жизни записи.
+CACHES['movies_detail'] = {
+    'BACKEND': os.environ.get(
+        'MOVIES_DETAIL_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+    ),
+    'LOCATION': os.environ.get('MOVIES_DETAIL_CACHE_LOCATION', 'movies-detail'),
+    'TIMEOUT': int(os.environ.get('MOVIES_DETAIL_CACHE_TIMEOUT', 300)),
+    'OPTIONS': {
+        'MAX_ENTRIES': int(os.environ.get('MOVIES_DETAIL_CACHE_MAX_ENTRIES', 10_000)),
+    },
+}
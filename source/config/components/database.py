@@ -1,5 +1,8 @@
+import copy
 import os
 
+from django.core.exceptions import ImproperlyConfigured
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -10,7 +13,84 @@ DATABASES = {
         'PORT': os.environ.get('DB_PORT', 5432),
         'OPTIONS': {
             # Нужно явно указать схемы, с которыми будет работать приложение.
+            # Параметр передается при открытии соединения, поэтому при постоянных
+            # соединениях и пуле search_path устанавливается один раз на соединение.
             'options': '-c search_path=public,content',
         },
     },
 }
+
+# Режим управления соединениями с PostgreSQL:
+# 'per_request' - соединение открывается и закрывается на каждый запрос,
+# 'persistent' - соединение потока переиспользуется DB_CONN_MAX_AGE секунд
+# и проверяется перед повторным использованием,
+# 'pool' - соединения берутся из пула внутри процесса (config.backends.postgresql_pool).
+# Под ASGI (MOVIES_API_ASYNC) запросы выполняются в разных потоках, постоянные соединения
+# не переиспользуются между ними и накапливаются до max_connections PostgreSQL,
+# поэтому там по умолчанию используется 'pool', а 'persistent' запрещен.
+_is_async = os.environ.get('MOVIES_API_ASYNC', 'False') == 'True'
+DB_CONNECTION_MODE = os.environ.get(
+    'DB_CONNECTION_MODE', 'pool' if _is_async else 'persistent'
+)
+
+if DB_CONNECTION_MODE == 'persistent' and _is_async:
+    raise ImproperlyConfigured(
+        'DB_CONNECTION_MODE=persistent leaks connections under ASGI (MOVIES_API_ASYNC), '
+        'use pool or per_request.'
+    )
+if DB_CONNECTION_MODE == 'persistent':
+    DATABASES['default'].update(
+        CONN_MAX_AGE=int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        CONN_HEALTH_CHECKS=True,
+    )
+elif DB_CONNECTION_MODE == 'pool':
+    DATABASES['default'].update(
+        ENGINE='config.backends.postgresql_pool',
+        # Соединение возвращается в пул в конце каждого запроса.
+        CONN_MAX_AGE=0,
+        POOL={
+            # Пул создается в каждом процессе, по умолчанию по числу потоков uWSGI (threads в uwsgi.ini):
+            # 4 процесса x 8 потоков = 32 соединения.
+            'MAX_SIZE': int(os.environ.get('DB_POOL_MAX_SIZE', 8)),
+            # Сколько секунд ждать свободного соединения.
+            'TIMEOUT': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+            # Через сколько секунд простоя соединение проверяется запросом SELECT 1 перед выдачей.
+            'HEALTH_CHECK_AFTER': float(
+                os.environ.get('DB_POOL_HEALTH_CHECK_AFTER', 30)
+            ),
+        },
+    )
+elif DB_CONNECTION_MODE != 'per_request':
+    raise ImproperlyConfigured(f'Unknown DB_CONNECTION_MODE: {DB_CONNECTION_MODE}')
+
+# Реплики только для чтения: адреса через запятую в виде host или host:port,
+# остальные параметры соединения берутся из основной базы. Реплики получают псевдонимы
+# replica, replica_2, ... Для локальной проверки можно указать адрес основной базы:
+# реплика будет тем же сервером под другим псевдонимом.
+DATABASE_REPLICAS = []
+for number, address in enumerate(
+    filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(',')), start=1
+):
+    host, _, port = address.strip().partition(':')
+    alias = 'replica' if number == 1 else f'replica_{number}'
+    DATABASES[alias] = copy.deepcopy(DATABASES['default'])
+    DATABASES[alias].update(
+        HOST=host,
+        PORT=port or DATABASES['default']['PORT'],
+        # В тестах реплика указывает на тестовую основную базу.
+        TEST={'MIRROR': 'default'},
+    )
+    DATABASE_REPLICAS.append(alias)
+
+# Чтение API (представления с replica_reads = True) идет на реплики по кругу,
+# остальное чтение, запись и миграции - на основную базу (config.routers.ReplicaRouter).
+DATABASE_ROUTERS = ['config.routers.ReplicaRouter'] if DATABASE_REPLICAS else []
+# Как часто (в секундах) фоновый поток проверяет доступность и отставание реплик.
+DB_REPLICA_CHECK_INTERVAL = float(os.environ.get('DB_REPLICA_CHECK_INTERVAL', 5))
+# Реплика, отставшая больше чем на столько секунд, исключается из чтения до следующей проверки.
+DB_REPLICA_MAX_LAG = float(os.environ.get('DB_REPLICA_MAX_LAG', 10))
+# Сколько секунд после фиксации изменений фильмов, жанров или участников (например,
+# сохранения в админке) все чтение идет с основной базы. Окно должно быть не меньше
+# DB_REPLICA_MAX_LAG и хранится в кэше default, поэтому с репликами нужен общий кэш
+# всех воркеров (CACHE_BACKEND), см. config/components/cache.py.
+DB_READ_YOUR_WRITES_SECONDS = int(os.environ.get('DB_READ_YOUR_WRITES_SECONDS', 10))
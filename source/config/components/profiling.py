@@ -0,0 +1,38 @@
+import json
+import os
+
+# Заголовок Server-Timing с временем SQL, сериализации и всего запроса (ProfilingMiddleware).
+MOVIES_PROFILING_SERVER_TIMING = (
+    os.environ.get('MOVIES_PROFILING_SERVER_TIMING', 'True') == 'True'
+)
+
+# Сколько запросов к БД может выполнить представление за один HTTP-запрос.
+# Переопределяется JSON-объектом в MOVIES_QUERY_BUDGETS: {"MoviesListApi": 4}.
+# Список фильмов: время изменения и страница, при промахе кэша количества - COUNT(*)
+# или EXPLAIN, а при промахе кэша статистики таблицы - еще запрос к pg_class.
+MOVIES_QUERY_BUDGETS = {
+    'MoviesListApi': 4,
+    'AsyncMoviesListApi': 4,
+    'MoviesDetailApi': 2,
+    'AsyncMoviesDetailApi': 2,
+    'MoviesExportApi': 2,
+    'AsyncMoviesExportApi': 2,
+    'MoviesChangesApi': 1,
+    'PersonsDetailApi': 2,
+    'PersonFilmsApi': 2,
+}
+if budgets := os.environ.get('MOVIES_QUERY_BUDGETS'):
+    MOVIES_QUERY_BUDGETS.update(json.loads(budgets))
+# Реакция на превышение бюджета: 'log' - предупреждение в лог movies.profiling,
+# 'raise' - ошибка QueryBudgetExceeded (для тестовых и dev-окружений).
+MOVIES_QUERY_BUDGET_MODE = os.environ.get('MOVIES_QUERY_BUDGET_MODE', 'log')
+
+# Эндпоинт /metrics с метриками запросов представлений в формате Prometheus.
+# Выключен по умолчанию, а включенный отвечает только персоналу (is_staff)
+# и адресам из MOVIES_METRICS_ALLOWED_NETWORKS. nginx /metrics не проксирует,
+# поэтому REMOTE_ADDR - адрес сборщика метрик, обращающегося к приложению напрямую.
+MOVIES_METRICS_ENABLED = os.environ.get('MOVIES_METRICS_ENABLED', 'False') == 'True'
+MOVIES_METRICS_ALLOWED_NETWORKS = os.environ.get(
+    'MOVIES_METRICS_ALLOWED_NETWORKS',
+    '127.0.0.0/8,::1/128,10.0.0.0/8,172.16.0.0/12,192.168.0.0/16',
+).split(',')
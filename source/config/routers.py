@@ -0,0 +1,223 @@
+import contextvars
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.http import HttpRequest
+
+logger = logging.getLogger(__name__)
+
+LAST_WRITE_KEY = 'movies:db:last_write'
+
+# Кэши, видимые только одному процессу: окно чтения с основной базы,
+# открытое в одном воркере, не действовало бы в остальных.
+PROCESS_LOCAL_CACHES = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+# Отставание реплики в секундах. На сервере, который не является репликой
+# (реплика указывает на основную базу), и на догнавшей основную реплике отставание нулевое.
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()
+        THEN 0
+        ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+
+@dataclass
+class ReadRouting:
+    """
+    Маршрутизация чтения текущего запроса. Реплика выбирается при первом чтении
+    и не меняется до конца запроса, чтобы все его запросы видели одно состояние данных.
+    """
+
+    replica_reads: bool = False
+    alias: str | None = None
+
+
+_routing: contextvars.ContextVar[ReadRouting | None] = contextvars.ContextVar(
+    'movies_read_routing', default=None
+)
+
+
+class ReplicaMonitor:
+    """
+    Выбирает реплики по кругу, пропуская недоступные и отставшие.
+    Доступность проверяет фоновый поток процесса, поэтому проверка не добавляет
+    запросов к обработке запроса и не требует синхронного контекста под ASGI.
+    До первой проверки реплика считается недоступной и чтение идет с основной базы.
+    """
+
+    def __init__(self, aliases: list[str], check_interval: float, max_lag: float):
+        self.aliases = aliases
+        self.check_interval = check_interval
+        self.max_lag = max_lag
+        self.healthy: set[str] = set()
+        self.cycle = itertools.cycle(aliases)
+        self.lock = threading.Lock()
+        self.thread: threading.Thread | None = None
+
+    def choose(self) -> str | None:
+        """
+        Возвращает следующую по кругу работоспособную реплику или None, если таких нет.
+        """
+        self.start()
+        with self.lock:
+            for _ in self.aliases:
+                alias = next(self.cycle)
+                if alias in self.healthy:
+                    return alias
+        return None
+
+    def start(self):
+        # Поток запускается при первом обращении в каждом процессе,
+        # так как потоки не переживают fork воркеров uWSGI.
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self.run, name='replica-monitor', daemon=True
+                )
+                self.thread.start()
+
+    def run(self):
+        while True:
+            for alias in self.aliases:
+                is_healthy = self.check(alias)
+                with self.lock:
+                    if is_healthy:
+                        self.healthy.add(alias)
+                    else:
+                        self.healthy.discard(alias)
+            time.sleep(self.check_interval)
+
+    def check(self, alias: str) -> bool:
+        connection = connections[alias]
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(REPLICA_LAG_SQL)
+                lag = cursor.fetchone()[0]
+        except DatabaseError as error:
+            logger.warning('Replica %s is unavailable: %s', alias, error)
+            return False
+        finally:
+            # Соединение возвращается в пул или закрывается, чтобы поток не держал его между проверками.
+            connection.close()
+
+        if lag is not None and lag > self.max_lag:
+            logger.warning('Replica %s lags behind by %.1f seconds.', alias, lag)
+            return False
+        return True
+
+
+_monitor: ReplicaMonitor | None = None
+_monitor_lock = threading.Lock()
+
+
+def get_monitor() -> ReplicaMonitor:
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            _monitor = ReplicaMonitor(
+                settings.DATABASE_REPLICAS,
+                settings.DB_REPLICA_CHECK_INTERVAL,
+                settings.DB_REPLICA_MAX_LAG,
+            )
+        return _monitor
+
+
+def mark_written():
+    """
+    Открывает окно чтения с основной базы после фиксации изменений каталога.
+    Окно общее для всех клиентов: сброс кэша карточек после записи иначе
+    позволил бы параллельному запросу закэшировать данные с отстающей реплики.
+    """
+    if settings.DATABASE_REPLICAS:
+        cache.set(LAST_WRITE_KEY, True, timeout=settings.DB_READ_YOUR_WRITES_SECONDS)
+
+
+def choose_read_alias() -> str:
+    if cache.get(LAST_WRITE_KEY):
+        return DEFAULT_DB_ALIAS
+    return get_monitor().choose() or DEFAULT_DB_ALIAS
+
+
+class ReplicaRouter:
+    """
+    Отправляет чтение представлений с replica_reads = True на реплики, а все остальное
+    (админку, запись, команды управления и миграции) - на основную базу.
+    """
+
+    def __init__(self):
+        if settings.CACHES['default']['BACKEND'] in PROCESS_LOCAL_CACHES:
+            raise ImproperlyConfigured(
+                'Read replicas (DB_REPLICA_HOSTS) require a cache shared by all workers '
+                'in CACHE_BACKEND for the read-your-writes window.'
+            )
+
+    def db_for_read(self, model, **hints):
+        routing = _routing.get()
+        if routing is None or not routing.replica_reads:
+            return DEFAULT_DB_ALIAS
+        if routing.alias is None:
+            routing.alias = choose_read_alias()
+        return routing.alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики содержат те же данные, что и основная база.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Разрешает чтение с реплик на время безопасных запросов к представлениям
+    с атрибутом replica_reads = True. Окно чтения с основной базы после записи
+    открывается при фиксации изменений каталога (movies.signals.FilmworkChanges).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    async def call_async(self, request: HttpRequest):
+        token = _routing.set(ReadRouting())
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing.reset(token)
+        return response
+
+    def process_view(self, request: HttpRequest, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        routing = _routing.get()
+        if routing is not None and request.method in {'GET', 'HEAD'}:
+            routing.replica_reads = getattr(view_class, 'replica_reads', False)
+
+    def __call__(self, request: HttpRequest):
+        if iscoroutinefunction(self):
+            return self.call_async(request)
+        token = _routing.set(ReadRouting())
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+        return response
@@ -7,6 +7,9 @@ from split_settings.tools import include
 load_dotenv()
 
 include('components/database.py')
+include('components/cache.py')
+include('components/api.py')
+include('components/profiling.py')
 
 LOGGING = {
     'version': 1,
@@ -27,13 +30,32 @@ LOGGING = {
             'formatter': 'default',
             'filters': ['require_debug_true'],
         },
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'default',
+        },
     },
     'loggers': {
         'django.db.backends': {
             'level': 'ERROR',
             'handlers': ['debug-console'],
             'propagate': False,
-        }
+        },
+        'movies.profiling': {
+            'level': 'WARNING',
+            'handlers': ['console'],
+            'propagate': False,
+        },
+        'config.routers': {
+            'level': 'WARNING',
+            'handlers': ['console'],
+            'propagate': False,
+        },
+        'movies.api.v1.http_cache': {
+            'level': 'WARNING',
+            'handlers': ['console'],
+            'propagate': False,
+        },
     },
 }
 
@@ -73,6 +95,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     # local apps
     'movies.apps.MoviesConfig',
     # third party apps
@@ -82,6 +105,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'debug_toolbar.middleware.DebugToolbarMiddleware',
+    'movies.profiling.ProfilingMiddleware',
+    'config.routers.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -1,12 +1,16 @@
 from config import settings
 from django.contrib import admin
 from django.urls import include, path
+from movies.profiling import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('movies.api.urls')),
 ]
 
+if settings.MOVIES_METRICS_ENABLED:
+    urlpatterns.append(path('metrics', metrics_view))
+
 if settings.DEBUG:
     import debug_toolbar
 
@@ -0,0 +1,10 @@
+import os
+
+import django
+
+
+def pytest_configure():
+    # Тесты строят SQL запросов без подключения к БД, поэтому хватает настроек проекта.
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    os.environ.setdefault('SECRET_KEY', 'test')
+    django.setup()
@@ -0,0 +1,38 @@
+# Конфигурация gunicorn для запуска приложения под ASGI, аналог uwsgi.ini:
+# MOVIES_API_ASYNC=True gunicorn config.asgi:application -c gunicorn.conf.py
+import os
+
+# порт, на котором принимаются запросы пользователей
+bind = ':8000'
+
+# воркеры uvicorn выполняют асинхронные представления в цикле событий,
+# поэтому число одновременных запросов не ограничено числом потоков,
+# как в uWSGI (processes x threads = 32)
+worker_class = 'uvicorn.workers.UvicornWorker'
+
+# количество процессов-воркеров
+# рекомендуется поставить число, не превышающее количество доступных ядер процессора
+workers = int(os.environ.get('GUNICORN_WORKERS', 4))
+
+# ленивая инициализация приложения, как lazy-apps в uWSGI
+preload_app = False
+
+# через какое количество запросов перезапустить воркер
+# разброс не дает всем воркерам перезапуститься одновременно
+max_requests = 500
+max_requests_jitter = 50
+
+# через сколько секунд перезапустить воркер, который не отвечает
+timeout = 60
+
+# как долго ждать обработки текущих запросов воркером до принудительной перезагрузки
+graceful_timeout = 60
+
+# сколько секунд держать открытым keep-alive соединение от nginx
+keepalive = 5
+
+# Под ASGI запросы ORM каждого HTTP-запроса выполняются в отдельном потоке,
+# поэтому постоянные соединения с БД (DB_CONNECTION_MODE=persistent) не переиспользуются
+# между запросами и накапливаются до max_connections PostgreSQL.
+# Поэтому при MOVIES_API_ASYNC=True режим persistent запрещен в настройках,
+# а по умолчанию используется DB_CONNECTION_MODE=pool.
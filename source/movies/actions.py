@@ -0,0 +1,224 @@
+from typing import Iterable
+
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.db import connection, transaction
+from django.db.models import Model
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from movies.api.v1.changes import add_tombstones
+from movies.api.v1.conditional import mark_deleted
+from movies.models import Filmwork, Genre, GenreFilmwork, Person, PersonFilmwork
+from movies.signals import evict_details_on_commit, invalidate_counts_on_commit
+
+# Действия админки выполняются фиксированным числом запросов независимо от количества выбранных записей.
+# Массовые запросы не отправляют сигналы моделей, поэтому кэш карточек, количества фильмов
+# и отметки modified, по которым обновляется витрина, поддерживаются здесь явно.
+
+MERGE_PERSONS_SQL = """
+WITH ranked AS (
+    SELECT
+        id,
+        row_number() OVER (
+            PARTITION BY film_work_id, role
+            ORDER BY person_id = %(target)s::uuid DESC, created, id
+        ) AS position
+    FROM {person_film_work}
+    WHERE person_id = %(target)s::uuid OR person_id = ANY(%(duplicates)s::uuid[])
+)
+DELETE FROM {person_film_work} AS link
+USING ranked
+WHERE link.id = ranked.id AND ranked.position > 1
+RETURNING link.film_work_id
+"""
+
+
+class FilmworkActionForm(ActionForm):
+    """
+    Форма действий над фильмами с параметрами действий: жанром и типом.
+    """
+
+    genre = forms.ModelChoiceField(
+        Genre.objects.all(), required=False, label=_('Genre')
+    )
+    film_type = forms.ChoiceField(
+        choices=[('', '---------'), *Filmwork.FilmworkTypes.choices],
+        required=False,
+        label=_('type'),
+    )
+
+
+def get_table(model: type[Model]) -> str:
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def get_ids(queryset) -> list[str]:
+    return [str(pk) for pk in queryset.values_list('pk', flat=True)]
+
+
+def execute_returning(sql: str, params) -> set:
+    """
+    Выполняет запрос с RETURNING одной колонки и возвращает ее значения.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return {row[0] for row in cursor.fetchall()}
+
+
+def delete_rows(model: type[Model], column: str, ids: list[str]) -> set:
+    """
+    Удаляет строки таблицы модели одним DELETE без загрузки объектов и каскада через Collector.
+    Для таблиц связей возвращает ID затронутых фильмов.
+    """
+    returning = 'film_work_id' if model in {GenreFilmwork, PersonFilmwork} else 'id'
+    return execute_returning(
+        f'DELETE FROM {get_table(model)} WHERE {column} = ANY(%s::uuid[]) '
+        f'RETURNING {returning}',
+        [ids],
+    )
+
+
+def touch_filmworks(film_ids: Iterable):
+    """
+    Отмечает изменение у фильмов, связи которых удалены, и сбрасывает кэш их карточек.
+    """
+    film_ids = list(film_ids)
+    Filmwork.objects.filter(id__in=film_ids).update(modified=timezone.now())
+    evict_details_on_commit(film_ids)
+
+
+def get_action_value(modeladmin, request, field: str):
+    """
+    Возвращает параметр действия из формы действий или None, если он не выбран.
+    """
+    form = modeladmin.action_form(request.POST)
+    if form.is_valid() and form.cleaned_data[field]:
+        return form.cleaned_data[field]
+    modeladmin.message_user(
+        request, _('Select a value for this action.'), messages.ERROR
+    )
+    return None
+
+
+@admin.action(description=_('Add genre to selected film works'), permissions=['change'])
+@transaction.atomic
+def add_genre(modeladmin, request, queryset):
+    if (genre := get_action_value(modeladmin, request, 'genre')) is None:
+        return
+    film_ids = get_ids(queryset)
+    GenreFilmwork.objects.bulk_create(
+        [GenreFilmwork(film_work_id=film_id, genre=genre) for film_id in film_ids],
+        ignore_conflicts=True,
+    )
+    invalidate_counts_on_commit()
+    evict_details_on_commit(film_ids)
+
+
+@admin.action(
+    description=_('Remove genre from selected film works'), permissions=['change']
+)
+@transaction.atomic
+def remove_genre(modeladmin, request, queryset):
+    if (genre := get_action_value(modeladmin, request, 'genre')) is None:
+        return
+    film_ids = execute_returning(
+        f'DELETE FROM {get_table(GenreFilmwork)} '
+        f'WHERE genre_id = %s AND film_work_id = ANY(%s::uuid[]) '
+        f'RETURNING film_work_id',
+        [str(genre.pk), get_ids(queryset)],
+    )
+    invalidate_counts_on_commit()
+    touch_filmworks(film_ids)
+
+
+@admin.action(
+    description=_('Change type of selected film works'), permissions=['change']
+)
+@transaction.atomic
+def change_type(modeladmin, request, queryset):
+    if (film_type := get_action_value(modeladmin, request, 'film_type')) is None:
+        return
+    film_ids = get_ids(queryset)
+    Filmwork.objects.filter(id__in=film_ids).update(
+        type=film_type, modified=timezone.now()
+    )
+    invalidate_counts_on_commit()
+    evict_details_on_commit(film_ids)
+
+
+@admin.action(description=_('Fast delete selected film works'), permissions=['delete'])
+@transaction.atomic
+def fast_delete_filmworks(modeladmin, request, queryset):
+    film_ids = get_ids(queryset)
+    delete_rows(GenreFilmwork, 'film_work_id', film_ids)
+    delete_rows(PersonFilmwork, 'film_work_id', film_ids)
+    deleted = delete_rows(Filmwork, 'id', film_ids)
+    mark_deleted(Filmwork)
+    add_tombstones(deleted)
+    invalidate_counts_on_commit()
+    evict_details_on_commit(film_ids)
+    modeladmin.message_user(
+        request, _('Deleted %(count)d film works.') % {'count': len(deleted)}
+    )
+
+
+@admin.action(description=_('Fast delete selected genres'), permissions=['delete'])
+@transaction.atomic
+def fast_delete_genres(modeladmin, request, queryset):
+    genre_ids = get_ids(queryset)
+    touch_filmworks(delete_rows(GenreFilmwork, 'genre_id', genre_ids))
+    deleted = delete_rows(Genre, 'id', genre_ids)
+    invalidate_counts_on_commit()
+    modeladmin.message_user(
+        request, _('Deleted %(count)d genres.') % {'count': len(deleted)}
+    )
+
+
+@admin.action(
+    description=_('Fast delete selected film crew members'), permissions=['delete']
+)
+@transaction.atomic
+def fast_delete_persons(modeladmin, request, queryset):
+    person_ids = get_ids(queryset)
+    touch_filmworks(delete_rows(PersonFilmwork, 'person_id', person_ids))
+    deleted = delete_rows(Person, 'id', person_ids)
+    invalidate_counts_on_commit()
+    modeladmin.message_user(
+        request, _('Deleted %(count)d film crew members.') % {'count': len(deleted)}
+    )
+
+
+@admin.action(description=_('Merge selected film crew members'), permissions=['change'])
+@transaction.atomic
+def merge_persons(modeladmin, request, queryset):
+    """
+    Сливает выбранных участников в самого раннего: связи остальных переносятся на него,
+    а связи, которые после переноса повторили бы существующие, удаляются.
+    """
+    person_ids = get_ids(queryset.order_by('created', 'id'))
+    if len(person_ids) < 2:
+        modeladmin.message_user(
+            request, _('Select at least two film crew members.'), messages.ERROR
+        )
+        return
+
+    target, duplicates = person_ids[0], person_ids[1:]
+    table = get_table(PersonFilmwork)
+    film_ids = execute_returning(
+        MERGE_PERSONS_SQL.format(person_film_work=table),
+        {'target': target, 'duplicates': duplicates},
+    )
+    film_ids |= execute_returning(
+        f'UPDATE {table} SET person_id = %s, modified = now() '
+        f'WHERE person_id = ANY(%s::uuid[]) RETURNING film_work_id',
+        [target, duplicates],
+    )
+    delete_rows(Person, 'id', duplicates)
+    touch_filmworks(film_ids)
+    invalidate_counts_on_commit()
+    modeladmin.message_user(
+        request,
+        _('Merged %(count)d film crew members into %(person)s.')
+        % {'count': len(duplicates), 'person': queryset.model.objects.get(pk=target)},
+    )
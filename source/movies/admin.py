@@ -1,6 +1,13 @@
+import uuid
+
 from django.contrib import admin
+from django.utils.translation import gettext_lazy as _
 
+from . import actions
+from .api.v1.counts import EstimatedCountPaginator
+from .formsets import CrewInlineFormSet
 from .models import Filmwork, Genre, GenreFilmwork, Person, PersonFilmwork
+from .search import search_films
 
 
 @admin.register(Genre)
@@ -10,19 +17,67 @@ class GenreAdmin(admin.ModelAdmin):
         'description',
     )
     search_fields = ('name',)
+    actions = (actions.fast_delete_genres,)
 
 
 class GenreFilmworkInline(admin.TabularInline):
     model = GenreFilmwork
+    autocomplete_fields = ('genre',)
 
 
 class PersonFilmworkInline(admin.TabularInline):
     model = PersonFilmwork
+    # Без автодополнения каждая строка inline выводит <select> со всеми участниками из базы.
+    autocomplete_fields = ('person',)
+    # У сериалов тысячи участников, поэтому связи выводятся постранично.
+    formset = CrewInlineFormSet
+    template = 'admin/movies/filmwork/crew_inline.html'
+
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        formset.request = request
+        return formset
+
+
+class RatingFilter(admin.SimpleListFilter):
+    """
+    Фильтр по диапазонам рейтинга вместо списка всех различных значений колонки.
+    Диапазон проверяется по индексу film_work_rating_idx.
+    """
+
+    title = _('rating')
+    parameter_name = 'rating_range'
+    step = 20
+
+    def lookups(self, request, model_admin):
+        return [
+            (str(low), f'{low}–{low + self.step}') for low in range(0, 100, self.step)
+        ]
+
+    def queryset(self, request, queryset):
+        if self.value() not in dict(self.lookup_choices):
+            return queryset
+        low = int(self.value())
+        lookups = {'rating__gte': low}
+        # Верхняя граница последнего диапазона включает максимальный рейтинг.
+        if low + self.step < 100:
+            lookups['rating__lt'] = low + self.step
+        return queryset.filter(**lookups)
 
 
 @admin.register(Filmwork)
 class FilmworkAdmin(admin.ModelAdmin):
     inlines = (GenreFilmworkInline, PersonFilmworkInline)
+    # Количество записей без фильтров не считается, а с фильтрами на больших таблицах оценивается.
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    action_form = actions.FilmworkActionForm
+    actions = (
+        actions.add_genre,
+        actions.remove_genre,
+        actions.change_type,
+        actions.fast_delete_filmworks,
+    )
 
     list_display = (
         'title',
@@ -32,16 +87,26 @@ class FilmworkAdmin(admin.ModelAdmin):
     )
     list_filter = (
         'type',
-        'rating',
+        RatingFilter,
     )
     search_fields = ('title', 'description', 'id')
 
-    def get_queryset(self, request):
-        qs = super().get_queryset(request)
-        return qs.prefetch_related('genres').prefetch_related('persons')
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Ищет фильм по ID или полнотекстовым поиском по названию и описанию
+        через GIN индекс film_work_search_idx вместо ILIKE по каждому полю.
+        """
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        try:
+            return queryset.filter(id=uuid.UUID(search_term)), False
+        except ValueError:
+            return search_films(queryset, search_term), False
 
 
 @admin.register(Person)
 class PersonAdmin(admin.ModelAdmin):
     list_display = ('full_name',)
     search_fields = ('full_name',)
+    actions = (actions.merge_persons, actions.fast_delete_persons)
@@ -0,0 +1,125 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.paginator import InvalidPage
+from django.db.models.query import QuerySet
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.translation import gettext as _
+from movies.api.v1 import conditional, serialization, views
+from movies.api.v1.cache import aget_detail, aset_detail
+from movies.api.v1.export import aiter_ndjson
+
+
+class AsyncMoviesApiMixin(views.MoviesApiMixin):
+    """
+    Асинхронные варианты представлений API для запуска под ASGI.
+    Запросы строятся теми же методами, что и в синхронных представлениях,
+    а выполняются через асинхронный интерфейс ORM (aiterator, acount, aget).
+    Сырой SQL и EXPLAIN асинхронного интерфейса не имеют и выполняются через sync_to_async.
+    Ответ без условных заголовков строят методы get_full_response_async конкретных представлений.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        if (response := self.validate_params(request)) is not None:
+            return response
+        last_modified = await sync_to_async(self.get_last_modified)()
+        if last_modified is None:
+            return await self.get_full_response_async(request, *args, **kwargs)
+
+        etag = conditional.make_etag(request.get_full_path(), last_modified)
+        response = conditional.get_not_modified_response(request, etag, last_modified)
+        if response is None:
+            response = await self.get_full_response_async(request, *args, **kwargs)
+        else:
+            self.set_cache_headers(response)
+        return conditional.set_validators(response, etag, last_modified)
+
+
+class AsyncMoviesListApi(AsyncMoviesApiMixin, views.MoviesListApi):
+    async def get_full_response_async(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        if ids := self.filter_form.cleaned_data['ids']:
+            rows = [row async for row in queryset.filter(id__in=ids)]
+            context = self.get_batch_context_data(ids, rows)
+        elif self.is_cursor_pagination():
+            context = await self.get_cursor_context_data_async(queryset)
+        else:
+            context = await self.get_page_context_data_async(queryset)
+        return self.render_to_response(context)
+
+    async def get_page_context_data_async(self, queryset: QuerySet) -> dict:
+        """
+        Возвращает страницу по номеру. Количество записей считается через acount,
+        после чего CountedPaginator вычисляет номера страниц без обращения к БД.
+        """
+        paginator = self.get_paginator(queryset, self.paginate_by)
+        await paginator.counter.acount()
+        page_number = self.request.GET.get(self.page_kwarg) or 1
+        if page_number == 'last':
+            page_number = paginator.num_pages
+        try:
+            page = paginator.page(page_number)
+        except InvalidPage as error:
+            raise Http404(
+                _('Invalid page (%(page_number)s): %(message)s')
+                % {
+                    'page_number': page_number,
+                    'message': str(error),
+                }
+            )
+        if settings.MOVIES_API_DB_JSON:
+            results = await sync_to_async(serialization.fetch_json_array)(
+                page.object_list
+            )
+        else:
+            results = [row async for row in page.object_list]
+        return self.get_page_context_data(paginator, page, results)
+
+    async def get_cursor_context_data_async(self, queryset: QuerySet) -> dict:
+        results, next_cursor, prev_cursor = await self.get_cursor_paginator(
+            queryset
+        ).apaginate(self.request.GET.get('cursor'))
+        return {'prev': prev_cursor, 'next': next_cursor, 'results': results}
+
+
+class AsyncMoviesDetailApi(AsyncMoviesApiMixin, views.MoviesDetailApi):
+    async def get_full_response_async(self, request, *args, **kwargs):
+        """
+        Отдает карточку фильма из кэша, а при промахе читает ее через aget и сохраняет в кэш.
+        """
+        if self.filter_form.cleaned_data['fields']:
+            return await self.get_film_response_async()
+        if (payload := await aget_detail(self.kwargs['pk'])) is not None:
+            return self.render_to_response(serialization.RawJSON(payload))
+
+        response = await self.get_film_response_async()
+        await aset_detail(self.kwargs['pk'], response.content)
+        return response
+
+    async def get_film_response_async(self) -> HttpResponse:
+        queryset = self.get_queryset()
+        if (film := await self.get_film_async(queryset)) is None:
+            raise Http404(
+                _('No %(verbose_name)s found matching the query')
+                % {'verbose_name': queryset.model._meta.verbose_name}
+            )
+        return self.render_to_response(film)
+
+    async def get_film_async(self, queryset: QuerySet):
+        """
+        Возвращает словарь с полями фильма, JSON карточки при MOVIES_API_DB_JSON
+        или None, если фильм не найден.
+        """
+        if settings.MOVIES_API_DB_JSON:
+            return await sync_to_async(serialization.fetch_json_object)(queryset)
+        try:
+            return await queryset.aget()
+        except queryset.model.DoesNotExist:
+            return None
+
+
+class AsyncMoviesExportApi(AsyncMoviesApiMixin, views.MoviesExportApi):
+    async def get_full_response_async(self, request, *args, **kwargs):
+        return StreamingHttpResponse(
+            aiter_ndjson(self.get_queryset(), self.chunk_size),
+            content_type='application/x-ndjson',
+        )
@@ -0,0 +1,37 @@
+from typing import Iterable
+
+from django.core.cache import caches
+
+DETAIL_CACHE_ALIAS = 'movies_detail'
+
+
+def get_detail_cache_key(film_id) -> str:
+    return f'movies:detail:{film_id}'
+
+
+def get_detail(film_id) -> bytes | None:
+    """
+    Возвращает сериализованную карточку фильма из кэша.
+    """
+    return caches[DETAIL_CACHE_ALIAS].get(get_detail_cache_key(film_id))
+
+
+def set_detail(film_id, payload: bytes):
+    caches[DETAIL_CACHE_ALIAS].set(get_detail_cache_key(film_id), payload)
+
+
+async def aget_detail(film_id) -> bytes | None:
+    return await caches[DETAIL_CACHE_ALIAS].aget(get_detail_cache_key(film_id))
+
+
+async def aset_detail(film_id, payload: bytes):
+    await caches[DETAIL_CACHE_ALIAS].aset(get_detail_cache_key(film_id), payload)
+
+
+def evict_details(film_ids: Iterable):
+    """
+    Удаляет из кэша карточки перечисленных фильмов.
+    """
+    keys = [get_detail_cache_key(film_id) for film_id in film_ids]
+    if keys:
+        caches[DETAIL_CACHE_ALIAS].delete_many(keys)
@@ -0,0 +1,136 @@
+import datetime
+import uuid
+from typing import Iterable
+
+from django.db import connection
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from movies.api.v1.pagination import decode_token, encode_token
+
+from movies import models
+
+# Наибольший UUID: водяной знак (since, MAX_UUID) пропускает все изменения, сделанные ровно в since.
+MAX_UUID = uuid.UUID(int=(1 << 128) - 1)
+
+CHANGES_SQL = """
+    SELECT
+        film_work_id,
+        max(modified) AS changed_at,
+        NOT EXISTS (
+            SELECT 1 FROM {film_work} AS film WHERE film.id = changes.film_work_id
+        ) AS deleted
+    FROM (
+        SELECT id AS film_work_id, modified FROM {film_work}
+        WHERE modified >= %(since)s
+        UNION ALL
+        SELECT film_work_id, modified FROM {genre_film_work}
+        WHERE modified >= %(since)s
+        UNION ALL
+        SELECT link.film_work_id, genre.modified
+        FROM {genre} AS genre JOIN {genre_film_work} AS link ON link.genre_id = genre.id
+        WHERE genre.modified >= %(since)s
+        UNION ALL
+        SELECT film_work_id, modified FROM {person_film_work}
+        WHERE modified >= %(since)s
+        UNION ALL
+        SELECT link.film_work_id, person.modified
+        FROM {person} AS person JOIN {person_film_work} AS link ON link.person_id = person.id
+        WHERE person.modified >= %(since)s
+        UNION ALL
+        SELECT id, deleted_at FROM {film_work_tombstone}
+        WHERE deleted_at >= %(since)s
+    ) AS changes
+    GROUP BY film_work_id
+    HAVING (max(modified), film_work_id) > (%(since)s, %(after_id)s)
+        AND max(modified) < %(until)s
+    ORDER BY changed_at, film_work_id
+    LIMIT %(limit)s
+"""
+
+
+def parse_watermark(
+    since: str | None, watermark: str | None
+) -> tuple[datetime.datetime, uuid.UUID]:
+    """
+    Возвращает границу ленты изменений (время, ID фильма) из водяного знака,
+    полученного в прошлом ответе, или из момента времени since.
+    Выбрасывает ValueError, если ни один из параметров не разобран.
+    """
+    if watermark:
+        payload = decode_token(watermark)
+        try:
+            moment = parse_datetime(payload['modified'])
+            film_id = uuid.UUID(payload['id'])
+        except (KeyError, TypeError, ValueError, AttributeError) as error:
+            # uuid.UUID и parse_datetime отвергают значения не строкового типа
+            # исключениями TypeError и AttributeError.
+            raise ValueError('Invalid watermark.') from error
+    elif since:
+        moment, film_id = parse_datetime(since), MAX_UUID
+    else:
+        raise ValueError('Either since or watermark is required.')
+
+    if moment is None:
+        raise ValueError('Invalid datetime.')
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment, datetime.timezone.utc)
+    return moment, film_id
+
+
+def make_watermark(moment: datetime.datetime, film_id: uuid.UUID) -> str:
+    return encode_token({'modified': moment.isoformat(), 'id': str(film_id)})
+
+
+def add_tombstones(film_ids: Iterable):
+    """
+    Отмечает удаление фильмов для ленты изменений. Повторное удаление фильма
+    с тем же ID (например, загруженного заново) обновляет время отметки.
+    """
+    deleted_at = timezone.now()
+    models.FilmworkTombstone.objects.bulk_create(
+        [
+            models.FilmworkTombstone(id=film_id, deleted_at=deleted_at)
+            for film_id in film_ids
+        ],
+        update_conflicts=True,
+        unique_fields=['id'],
+        update_fields=['deleted_at'],
+    )
+
+
+def get_changes(
+    since: datetime.datetime, after_id: uuid.UUID, limit: int, lag: datetime.timedelta
+) -> list[tuple[uuid.UUID, datetime.datetime, bool]]:
+    """
+    Возвращает до limit троек (ID фильма, время последнего изменения, признак удаления)
+    по возрастанию пары (время, ID) начиная после (since, after_id). Изменение фильма -
+    это изменение его записи, связей с жанрами и участниками, самих связанных жанров
+    и участников или удаление фильма. Фильм считается удаленным, если его нет в film_work
+    на момент запроса: фильм, удаленный и загруженный заново, приходит как измененный.
+    Изменения моложе lag не отдаются: транзакция, записавшая их, могла еще не зафиксироваться,
+    и клиент перешагнул бы водяным знаком через изменения, которые станут видны позже.
+    """
+    quote_name = connection.ops.quote_name
+    tables = {
+        'film_work': models.Filmwork,
+        'genre_film_work': models.GenreFilmwork,
+        'genre': models.Genre,
+        'person_film_work': models.PersonFilmwork,
+        'person': models.Person,
+        'film_work_tombstone': models.FilmworkTombstone,
+    }
+    table_names = {
+        name: quote_name(model._meta.db_table) for name, model in tables.items()
+    }
+    sql = CHANGES_SQL.format(**table_names)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            sql,
+            {
+                'since': since,
+                'after_id': after_id,
+                'until': timezone.now() - lag,
+                'limit': limit,
+            },
+        )
+        return cursor.fetchall()
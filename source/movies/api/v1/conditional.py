@@ -0,0 +1,131 @@
+import datetime
+import hashlib
+
+from django.db import connections, router
+from django.db.models import Max, Model, OuterRef, Subquery
+from django.db.models.functions import Greatest
+from django.http import HttpRequest, HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from movies import models
+
+
+def mark_deleted(model: type[Model]):
+    """
+    Запоминает в БД время удаления строк модели: список фильмов от удаления меняется,
+    и время должно попасть в Last-Modified и ETag списка во всех процессах.
+    Вызывается в транзакции удаления, поэтому отметка фиксируется вместе с ним.
+    """
+    models.DeletionMark.objects.bulk_create(
+        [models.DeletionMark(model=model._meta.label_lower, deleted_at=timezone.now())],
+        update_conflicts=True,
+        unique_fields=['model'],
+        update_fields=['deleted_at'],
+    )
+
+
+def get_list_last_modified(read_model: bool) -> datetime.datetime | None:
+    """
+    Возвращает время последнего изменения данных, из которых строится список фильмов.
+    Каждый максимум берется по индексу на колонке modified, поэтому запрос не сканирует таблицы.
+    Время последнего удаления читается из DeletionMark тем же запросом.
+    """
+    if read_model:
+        deleted_model = models.FilmworkReadModel
+        tables_columns = [(models.FilmworkReadModel._meta.db_table, 'refreshed_at')]
+    else:
+        deleted_model = models.Filmwork
+        tables_columns = [
+            (model._meta.db_table, 'modified')
+            for model in (
+                models.Filmwork,
+                models.GenreFilmwork,
+                models.PersonFilmwork,
+                models.Genre,
+                models.Person,
+            )
+        ]
+
+    connection = connections[router.db_for_read(models.Filmwork)]
+    quote_name = connection.ops.quote_name
+    subqueries = ', '.join(
+        f'(SELECT max({quote_name(column)}) FROM {quote_name(table)})'
+        for table, column in tables_columns
+    )
+    deleted_at = (
+        f'(SELECT {quote_name("deleted_at")} '
+        f'FROM {quote_name(models.DeletionMark._meta.db_table)} '
+        f'WHERE {quote_name("model")} = %s)'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT GREATEST({subqueries}, {deleted_at})',
+            [deleted_model._meta.label_lower],
+        )
+        return cursor.fetchone()[0]
+
+
+def get_film_last_modified(film_id, read_model: bool) -> datetime.datetime | None:
+    """
+    Возвращает время последнего изменения фильма, его связей, жанров и участников.
+    Для несуществующего фильма возвращает None.
+    """
+    if read_model:
+        query_set = models.FilmworkReadModel.objects.filter(id=film_id).values_list(
+            'refreshed_at', flat=True
+        )
+        return query_set.first()
+
+    genres = (
+        models.GenreFilmwork.objects.filter(film_work=OuterRef('pk'))
+        .values('film_work')
+        .annotate(last_modified=Greatest(Max('modified'), Max('genre__modified')))
+        .values('last_modified')
+    )
+    persons = (
+        models.PersonFilmwork.objects.filter(film_work=OuterRef('pk'))
+        .values('film_work')
+        .annotate(last_modified=Greatest(Max('modified'), Max('person__modified')))
+        .values('last_modified')
+    )
+    query_set = (
+        models.Filmwork.objects.filter(id=film_id)
+        .annotate(
+            last_modified=Greatest('modified', Subquery(genres), Subquery(persons))
+        )
+        .values_list('last_modified', flat=True)
+    )
+    return query_set.first()
+
+
+def make_etag(path: str, last_modified: datetime.datetime) -> str:
+    """
+    Возвращает слабый ETag: порядок элементов в массивах ответа не гарантирован,
+    поэтому побайтового совпадения ответов с одинаковым ETag не обещается.
+    """
+    digest = hashlib.md5(
+        f'{path}|{last_modified.isoformat()}'.encode(), usedforsecurity=False
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def get_not_modified_response(
+    request: HttpRequest, etag: str, last_modified: datetime.datetime
+) -> HttpResponse | None:
+    """
+    Возвращает ответ 304 (или 412), если данные у клиента актуальны, иначе None.
+    """
+    return get_conditional_response(
+        request, etag=etag, last_modified=int(last_modified.timestamp())
+    )
+
+
+def set_validators(
+    response: HttpResponse, etag: str, last_modified: datetime.datetime
+) -> HttpResponse:
+    if response.status_code in {200, 304}:
+        response.headers['ETag'] = etag
+        response.headers['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
@@ -0,0 +1,160 @@
+import hashlib
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models.query import QuerySet
+from django.utils.functional import cached_property
+
+GENERATION_KEY = 'movies:count:generation'
+
+
+def get_filters_signature(params: dict) -> str:
+    """
+    Возвращает подпись набора фильтров запроса, не зависящую от порядка параметров.
+    """
+    payload = json.dumps(sorted(params.items()), separators=(',', ':'))
+    return hashlib.md5(payload.encode(), usedforsecurity=False).hexdigest()
+
+
+def invalidate_counts():
+    """
+    Сбрасывает все закэшированные количества, меняя поколение ключей кэша.
+    Старые ключи не удаляются явно и вытесняются по таймауту.
+    """
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 1, timeout=None)
+
+
+def get_table_estimate(query_set: QuerySet) -> int:
+    """
+    Возвращает количество строк таблицы модели по статистике pg_class.reltuples.
+    Для таблиц, по которым еще не собиралась статистика, возвращает -1.
+    Статистика меняется только при ANALYZE, поэтому оценка кэшируется
+    и не добавляет запроса к каждому подсчету.
+    """
+    table = query_set.model._meta.db_table.replace('"', '')
+    cache_key = f'movies:count:estimate:{table}'
+    if (cached := cache.get(cache_key)) is not None:
+        return cached
+
+    with connections[query_set.db].cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [table]
+        )
+        row = cursor.fetchone()
+    estimate = row[0] if row else -1
+    cache.set(cache_key, estimate, timeout=settings.MOVIES_API_COUNT_CACHE_TIMEOUT)
+    return estimate
+
+
+def get_plan_estimate(query_set: QuerySet) -> int:
+    """
+    Возвращает оценку количества строк запроса из плана PostgreSQL без его выполнения.
+    """
+    plan = json.loads(query_set.explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class FilmworkCounter:
+    """
+    Количество фильмов для постраничного вывода.
+    На больших таблицах вместо COUNT(*) используется оценка PostgreSQL.
+    Количество (точное или оценка) кэшируется для каждой подписи фильтров до изменения фильмов.
+    """
+
+    def __init__(self, query_set: QuerySet, filters: dict):
+        self.query_set = query_set
+        self.filters = filters
+        self.exact = True
+
+    @cached_property
+    def count(self) -> int:
+        cache_key = self.get_cache_key()
+        if (cached := cache.get(cache_key)) is None:
+            cached = self.get_count()
+            cache.set(
+                cache_key, cached, timeout=settings.MOVIES_API_COUNT_CACHE_TIMEOUT
+            )
+        count, self.exact = cached
+        return count
+
+    def get_count(self) -> tuple[int, bool]:
+        """
+        Возвращает количество и признак того, что оно точное.
+        """
+        estimate = get_table_estimate(self.query_set)
+        if estimate < settings.MOVIES_API_COUNT_ESTIMATE_THRESHOLD:
+            return self.query_set.count(), True
+        if self.filters:
+            estimate = get_plan_estimate(self.query_set)
+        return estimate, False
+
+    async def acount(self) -> int:
+        """
+        Асинхронный вариант count для ASGI представлений.
+        Результат сохраняется в count, поэтому CountedPaginator дальше не обращается к БД.
+        """
+        if 'count' not in self.__dict__:
+            self.__dict__['count'] = await self.get_count_async()
+        return self.count
+
+    async def get_count_async(self) -> int:
+        cache_key = await sync_to_async(self.get_cache_key)()
+        if (cached := await cache.aget(cache_key)) is None:
+            cached = await self.get_count_and_exact_async()
+            await cache.aset(
+                cache_key, cached, timeout=settings.MOVIES_API_COUNT_CACHE_TIMEOUT
+            )
+        count, self.exact = cached
+        return count
+
+    async def get_count_and_exact_async(self) -> tuple[int, bool]:
+        """
+        Асинхронный вариант get_count: точный подсчет выполняется через acount.
+        """
+        estimate = await sync_to_async(get_table_estimate)(self.query_set)
+        if estimate < settings.MOVIES_API_COUNT_ESTIMATE_THRESHOLD:
+            return await self.query_set.acount(), True
+        if self.filters:
+            estimate = await sync_to_async(get_plan_estimate)(self.query_set)
+        return estimate, False
+
+    def get_cache_key(self) -> str:
+        generation = cache.get_or_set(GENERATION_KEY, 0, timeout=None)
+        return f'movies:counts:{generation}:{get_filters_signature(self.filters)}'
+
+
+class CountedPaginator(Paginator):
+    """
+    Paginator, получающий количество записей от FilmworkCounter вместо COUNT(*) по выборке.
+    """
+
+    def __init__(self, object_list, per_page, counter: FilmworkCounter, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.counter = counter
+
+    @cached_property
+    def count(self) -> int:
+        return self.counter.count
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator, который на больших таблицах берет количество записей из плана PostgreSQL
+    вместо COUNT(*). Номер последней страницы при этом приблизительный.
+    """
+
+    @cached_property
+    def count(self) -> int:
+        if (
+            get_table_estimate(self.object_list)
+            < settings.MOVIES_API_COUNT_ESTIMATE_THRESHOLD
+        ):
+            return super().count
+        return get_plan_estimate(self.object_list)
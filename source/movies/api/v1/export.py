@@ -0,0 +1,22 @@
+from typing import AsyncIterator, Iterator
+
+from django.db.models.query import QuerySet
+from movies.api.v1.serialization import dumps
+
+
+def iter_ndjson(query_set: QuerySet, chunk_size: int) -> Iterator[bytes]:
+    """
+    Построчно сериализует выборку в NDJSON.
+    Записи читаются серверным курсором пачками по chunk_size,
+    поэтому потребление памяти не зависит от размера каталога.
+    """
+    for row in query_set.iterator(chunk_size=chunk_size):
+        yield dumps(row) + b'\n'
+
+
+async def aiter_ndjson(query_set: QuerySet, chunk_size: int) -> AsyncIterator[bytes]:
+    """
+    Асинхронный вариант iter_ndjson для потоковой выдачи под ASGI.
+    """
+    async for row in query_set.aiterator(chunk_size=chunk_size):
+        yield dumps(row) + b'\n'
@@ -0,0 +1,149 @@
+import uuid
+
+from django import forms
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models.query import QuerySet
+from django.utils.translation import gettext_lazy as _
+from movies.models import Filmwork, PersonFilmwork
+from movies.search import filter_by_genre, filter_by_person, search_films
+
+# Допустимые сортировки списка. Каждая покрыта составным индексом (поле, id) у Filmwork
+# и у витрины FilmworkReadModel, поэтому страница читается по индексу без сортировки всей таблицы.
+# id делает порядок однозначным и имеет то же направление, чтобы индекс читался в одну сторону.
+SORT_ORDERINGS = {
+    'creation_date': ('creation_date', 'id'),
+    '-creation_date': ('-creation_date', '-id'),
+    'rating': ('rating', 'id'),
+    '-rating': ('-rating', '-id'),
+    'title': ('title', 'id'),
+}
+DEFAULT_SORT = 'creation_date'
+
+# Поля ответа в порядке, в котором их возвращает values() для Filmwork с аннотациями.
+RESPONSE_FIELDS = (
+    'created',
+    'modified',
+    'id',
+    'title',
+    'description',
+    'creation_date',
+    'rating',
+    'type',
+    'genres',
+    'actors',
+    'directors',
+    'writers',
+)
+
+
+class FieldListField(forms.CharField):
+    """
+    Имена полей ответа через запятую. Возвращает их в порядке choices,
+    id включается всегда. Пустое значение означает все поля.
+    """
+
+    def __init__(self, *, choices: tuple[str, ...], **kwargs):
+        super().__init__(**kwargs)
+        self.choices = choices
+
+    def to_python(self, value) -> tuple[str, ...]:
+        names = {name.strip() for name in super().to_python(value).split(',')} - {''}
+        if unknown := names - set(self.choices):
+            raise ValidationError(
+                _('Unknown fields: %(fields)s.'),
+                params={'fields': ', '.join(sorted(unknown))},
+            )
+        if not names:
+            return ()
+        return tuple(name for name in self.choices if name in names or name == 'id')
+
+
+class MoviesFieldsForm(forms.Form):
+    """
+    Выбор полей ответа (sparse fieldset) для списка и карточки фильма.
+    """
+
+    fields = FieldListField(required=False, choices=RESPONSE_FIELDS)
+
+
+class MoviesFilterForm(MoviesFieldsForm):
+    """
+    Параметры фильтрации и сортировки списка фильмов.
+    Незаполненные параметры фильтрации не ограничивают выборку.
+    """
+
+    query = forms.CharField(required=False, max_length=256)
+    genre = forms.CharField(required=False, max_length=255)
+    person = forms.CharField(required=False, min_length=3, max_length=255)
+    type = forms.ChoiceField(required=False, choices=Filmwork.FilmworkTypes.choices)
+    rating_min = forms.FloatField(required=False, min_value=0, max_value=100)
+    rating_max = forms.FloatField(required=False, min_value=0, max_value=100)
+    date_from = forms.DateField(required=False)
+    date_to = forms.DateField(required=False)
+    sort = forms.ChoiceField(
+        required=False, choices=[(key, key) for key in SORT_ORDERINGS]
+    )
+    # ID фильмов через запятую для выдачи карточек пачкой вместо постраничного списка.
+    ids = forms.CharField(required=False)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        ranges = (('rating_min', 'rating_max'), ('date_from', 'date_to'))
+        for lower, upper in ranges:
+            lower_value, upper_value = cleaned_data.get(lower), cleaned_data.get(upper)
+            if None not in (lower_value, upper_value) and lower_value > upper_value:
+                raise ValidationError(
+                    _('%(lower)s must not be greater than %(upper)s.'),
+                    params={'lower': lower, 'upper': upper},
+                )
+        return cleaned_data
+
+    def clean_ids(self) -> list[uuid.UUID]:
+        values = [value for value in self.cleaned_data['ids'].split(',') if value]
+        if len(values) > settings.MOVIES_API_BATCH_MAX_IDS:
+            raise ValidationError(
+                _('At most %(limit)d IDs can be requested at once.'),
+                params={'limit': settings.MOVIES_API_BATCH_MAX_IDS},
+            )
+        try:
+            return [uuid.UUID(value.strip()) for value in values]
+        except ValueError as error:
+            raise ValidationError(_('Enter a valid UUID.')) from error
+
+    def get_ordering(self) -> tuple[str, ...]:
+        return SORT_ORDERINGS[self.cleaned_data['sort'] or DEFAULT_SORT]
+
+    def apply(self, query_set: QuerySet) -> QuerySet:
+        """
+        Применяет к выборке фильмов заполненные параметры.
+        Работает и с Filmwork, и с витриной FilmworkReadModel.
+        """
+        data = self.cleaned_data
+        if data['query']:
+            query_set = search_films(query_set, data['query'])
+        if data['genre']:
+            query_set = filter_by_genre(query_set, data['genre'])
+        if data['person']:
+            query_set = filter_by_person(query_set, data['person'])
+        lookups = {
+            'type': data['type'] or None,
+            'rating__gte': data['rating_min'],
+            'rating__lte': data['rating_max'],
+            'creation_date__gte': data['date_from'],
+            'creation_date__lte': data['date_to'],
+        }
+        lookups = {
+            lookup: value for lookup, value in lookups.items() if value is not None
+        }
+        return query_set.filter(**lookups)
+
+
+class PersonFilmsFilterForm(forms.Form):
+    """
+    Параметры фильмографии участника: роль, фильмы в которой нужно вернуть.
+    """
+
+    role = forms.ChoiceField(
+        required=False, choices=PersonFilmwork.PersonFilmworkRoles.choices
+    )
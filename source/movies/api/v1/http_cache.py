@@ -0,0 +1,90 @@
+import http.client
+import logging
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from typing import Iterable
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control
+
+logger = logging.getLogger(__name__)
+
+# Ключ ответов, зависящих от всего каталога (страницы списка фильмов).
+LIST_SURROGATE_KEY = 'movies'
+LIST_PATH = '/api/v1/movies/'
+
+
+def get_film_surrogate_key(film_id) -> str:
+    return f'film-{film_id}'
+
+
+def get_film_path(film_id) -> str:
+    return f'{LIST_PATH}{film_id}/'
+
+
+def set_cache_headers(response: HttpResponse, keys: Iterable[str]) -> HttpResponse:
+    """
+    Разрешает общим кэшам (nginx, CDN) хранить ответ MOVIES_API_CACHE_MAX_AGE секунд
+    и отдавать устаревший ответ, пока он обновляется. Браузеры перепроверяют ответ
+    при каждом запросе по ETag, поэтому изменения видны им сразу после сброса общего кэша.
+    Surrogate-Key перечисляет данные ответа для адресного сброса в CDN.
+    """
+    patch_cache_control(
+        response,
+        public=True,
+        max_age=0,
+        s_maxage=settings.MOVIES_API_CACHE_MAX_AGE,
+        stale_while_revalidate=settings.MOVIES_API_CACHE_STALE,
+    )
+    response.headers['Surrogate-Key'] = ' '.join(keys)
+    return response
+
+
+def purge_films(film_ids: Iterable):
+    """
+    Обновляет в кэше nginx карточки фильмов и первую страницу списка: запрашивает их
+    через nginx с заголовком X-Cache-Refresh, по которому nginx идет мимо кэша и сохраняет
+    свежий ответ. Остальные страницы списка устаревают не дольше чем на время жизни кэша.
+    Вызывается после фиксации транзакции и сброса кэша карточек в Django.
+    """
+    if not settings.MOVIES_API_CACHE_PURGE_URL:
+        return
+    paths = [LIST_PATH, *(get_film_path(film_id) for film_id in film_ids)]
+    if len(paths) > settings.MOVIES_API_CACHE_PURGE_MAX_PATHS:
+        # Массовые изменения (например, переименование популярного жанра)
+        # не обходятся по одной карточке, они устаревают по времени жизни кэша.
+        paths = [LIST_PATH]
+    # Запросы идут через nginx в то же приложение, поэтому выполняются в отдельном потоке,
+    # чтобы сохранение в админке не ждало их при занятых воркерах.
+    threading.Thread(
+        target=refresh_paths, args=(paths,), name='cache-refresh', daemon=True
+    ).start()
+
+
+def refresh_paths(paths: list[str]):
+    for path in paths:
+        refresh(path)
+
+
+def refresh(path: str):
+    request = urllib.request.Request(
+        urllib.parse.urljoin(settings.MOVIES_API_CACHE_PURGE_URL, path),
+        headers={
+            'Host': settings.MOVIES_API_CACHE_PURGE_HOST,
+            'X-Cache-Refresh': '1',
+        },
+    )
+    try:
+        with urllib.request.urlopen(
+            request, timeout=settings.MOVIES_API_CACHE_PURGE_TIMEOUT
+        ) as response:
+            response.read()
+    except urllib.error.HTTPError as error:
+        # Удаленный фильм отвечает 404: такой ответ nginx не кэширует,
+        # и старая карточка устаревает по времени жизни кэша.
+        logger.info('Cache refresh of %s returned %s.', path, error.code)
+    except (OSError, http.client.HTTPException) as error:
+        logger.warning('Cache refresh of %s failed: %s', path, error)
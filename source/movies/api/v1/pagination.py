@@ -0,0 +1,176 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Field, Func, Value
+from django.db.models.lookups import GreaterThan, LessThan
+from django.db.models.query import QuerySet
+from django.http import HttpResponse
+from django.utils.translation import gettext as _
+from movies.api.v1 import serialization
+
+
+class Row(Func):
+    """
+    Конструктор строки ROW(...) для сравнения составных ключей целиком,
+    что позволяет PostgreSQL искать границу страницы по индексу.
+    """
+
+    function = 'ROW'
+    output_field = Field()
+
+
+class CursorPaginator:
+    """
+    Постраничная навигация по ключу (keyset) вместо OFFSET/LIMIT.
+    Курсор хранит значения ключа сортировки крайней записи страницы и направление обхода,
+    поэтому глубина страницы не влияет на стоимость запроса, а общее количество записей не считается.
+    """
+
+    def __init__(self, query_set: QuerySet, per_page: int, ordering: tuple[str, ...]):
+        descending = {field.startswith('-') for field in ordering}
+        if len(descending) != 1:
+            raise ValueError('All ordering fields must have the same direction.')
+
+        self.query_set = query_set
+        self.per_page = per_page
+        self.ordering = ordering
+        self.descending = descending.pop()
+        self.fields = [field.lstrip('-') for field in ordering]
+        self.model_fields = [
+            query_set.model._meta.get_field(field) for field in self.fields
+        ]
+
+    def paginate(self, cursor: str | None) -> tuple[list, str | None, str | None]:
+        """
+        Возвращает записи страницы, следующую за cursor, и курсоры соседних страниц.
+        Выбрасывает ValueError, если курсор не удалось разобрать.
+        """
+        key, backwards = self.decode(cursor) if cursor else (None, False)
+        rows = list(self.get_page_queryset(key, backwards))
+        return self.make_page(rows, key, backwards)
+
+    async def apaginate(
+        self, cursor: str | None
+    ) -> tuple[list, str | None, str | None]:
+        """
+        Асинхронный вариант paginate.
+        """
+        key, backwards = self.decode(cursor) if cursor else (None, False)
+        rows = [row async for row in self.get_page_queryset(key, backwards)]
+        return self.make_page(rows, key, backwards)
+
+    def get_page_queryset(self, key: list | None, backwards: bool) -> QuerySet:
+        """
+        Возвращает выборку страницы за ключом key в направлении обхода.
+        Запрашивается на одну запись больше размера страницы, чтобы не считать остаток.
+        """
+        query_set = self.query_set
+        if key is not None:
+            query_set = query_set.filter(self.get_seek_lookup(key, backwards))
+        ordering = self.reverse_ordering() if backwards else self.ordering
+        return query_set.order_by(*ordering)[: self.per_page + 1]
+
+    def make_page(
+        self, rows: list, key: list | None, backwards: bool
+    ) -> tuple[list, str | None, str | None]:
+        """
+        Отрезает от выбранных записей лишнюю и строит курсоры соседних страниц.
+        """
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if backwards:
+            rows.reverse()
+        if not rows:
+            return rows, None, None
+
+        if backwards:
+            has_next, has_prev = True, has_more
+        else:
+            has_next, has_prev = has_more, key is not None
+        next_cursor = self.encode(rows[-1], backwards=False) if has_next else None
+        prev_cursor = self.encode(rows[0], backwards=True) if has_prev else None
+        return rows, next_cursor, prev_cursor
+
+    def get_seek_lookup(self, key: list, backwards: bool):
+        """
+        Возвращает условие ROW(поля) > ROW(значения) для перехода за границу страницы.
+        Для убывающей сортировки и обхода назад знак сравнения меняется.
+        """
+        columns = [F(field) for field in self.fields]
+        values = [
+            Value(value, output_field=field)
+            for field, value in zip(self.model_fields, key)
+        ]
+        lookup = GreaterThan if self.descending == backwards else LessThan
+        return lookup(Row(*columns), Row(*values))
+
+    def reverse_ordering(self) -> list[str]:
+        return [
+            field[1:] if field.startswith('-') else f'-{field}'
+            for field in self.ordering
+        ]
+
+    def encode(self, row: dict, backwards: bool) -> str:
+        """
+        Упаковывает ключ записи и порядок, для которого он получен, в непрозрачный курсор.
+        """
+        key = [str(row[field]) for field in self.fields]
+        return encode_token(
+            {'key': key, 'backwards': backwards, 'ordering': list(self.ordering)}
+        )
+
+    def decode(self, cursor: str) -> tuple[list, bool]:
+        """
+        Распаковывает курсор, созданный методом encode, и приводит значения ключа к типам полей.
+        Курсор, полученный для другого порядка записей, считается поврежденным.
+        """
+        payload = decode_token(cursor)
+        try:
+            key, backwards = payload['key'], payload['backwards']
+            ordering = payload['ordering']
+        except (KeyError, TypeError) as error:
+            raise ValueError('Invalid cursor.') from error
+
+        if ordering != list(self.ordering):
+            raise ValueError('Invalid cursor.')
+        if not isinstance(key, list) or len(key) != len(self.fields):
+            raise ValueError('Invalid cursor.')
+        try:
+            key = [
+                field.to_python(value) for field, value in zip(self.model_fields, key)
+            ]
+        except (ValidationError, TypeError, ValueError, AttributeError) as error:
+            # Значение ключа не того типа (например, число или список вместо даты)
+            # to_python полей отвергает не ValidationError, а исключениями разбора.
+            raise ValueError('Invalid cursor.') from error
+        return key, bool(backwards)
+
+
+def encode_token(payload: dict) -> str:
+    """
+    Упаковывает данные в непрозрачную строку, пригодную для передачи в URL.
+    """
+    data = json.dumps(payload, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+
+def decode_token(token: str) -> dict:
+    """
+    Распаковывает строку, созданную encode_token.
+    Выбрасывает ValueError, если строка повреждена.
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError as error:
+        raise ValueError('Invalid cursor.') from error
+
+
+def invalid_cursor_response() -> HttpResponse:
+    """
+    Ответ 400 на поврежденный курсор в том же формате, что и ошибки формы параметров.
+    """
+    return serialization.json_response(
+        {'detail': {'cursor': [_('Invalid cursor.')]}}, status=400
+    )
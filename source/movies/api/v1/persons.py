@@ -0,0 +1,100 @@
+from django.db.models import Count, F
+from django.db.models.query import QuerySet
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils.translation import gettext as _
+from django.views.generic.base import View
+from movies.api.v1 import serialization
+from movies.api.v1.filters import PersonFilmsFilterForm
+from movies.api.v1.pagination import CursorPaginator, invalid_cursor_response
+from movies.models import Person, PersonFilmwork
+
+
+class PersonsDetailApi(View):
+    """
+    Карточка участника с количеством фильмов в каждой роли.
+    """
+
+    http_method_names = ['get']
+    replica_reads = True
+
+    def get(self, request, *args, **kwargs):
+        person = get_object_or_404(
+            Person.objects.values('id', 'full_name'), pk=kwargs['pk']
+        )
+        # Группировка по роли читает только индекс person_film_work_person_idx.
+        roles = (
+            PersonFilmwork.objects.filter(person_id=kwargs['pk'], role__isnull=False)
+            .values('role')
+            .annotate(films=Count('film_work_id'))
+            .order_by('role')
+        )
+        return serialization.json_response(
+            {**person, 'roles': {row['role']: row['films'] for row in roles}}
+        )
+
+
+class PersonFilmsApi(View):
+    """
+    Фильмография участника, сгруппированная по ролям.
+    Страницы строятся по ключу (роль, ID фильма), то есть по индексу person_film_work_person_idx,
+    поэтому стоимость страницы не зависит ни от ее глубины, ни от размера фильмографии.
+    """
+
+    http_method_names = ['get']
+    replica_reads = True
+    paginate_by = 50
+    ordering = ('role', 'film_work_id')
+
+    def get(self, request, *args, **kwargs):
+        form = PersonFilmsFilterForm(request.GET)
+        if not form.is_valid():
+            return serialization.json_response({'detail': form.errors}, status=400)
+        if not Person.objects.filter(pk=kwargs['pk']).exists():
+            raise Http404(
+                _('No %(verbose_name)s found matching the query')
+                % {'verbose_name': Person._meta.verbose_name}
+            )
+
+        paginator = CursorPaginator(
+            self.get_queryset(form.cleaned_data['role']),
+            self.paginate_by,
+            self.ordering,
+        )
+        try:
+            rows, next_cursor, prev_cursor = paginator.paginate(
+                request.GET.get('cursor')
+            )
+        except ValueError:
+            return invalid_cursor_response()
+        return serialization.json_response(
+            {'prev': prev_cursor, 'next': next_cursor, 'results': group_by_role(rows)}
+        )
+
+    def get_queryset(self, role: str) -> QuerySet:
+        links = PersonFilmwork.objects.filter(
+            person_id=self.kwargs['pk'], role__isnull=False
+        )
+        if role:
+            links = links.filter(role=role)
+        return links.values(
+            'role',
+            'film_work_id',
+            title=F('film_work__title'),
+            creation_date=F('film_work__creation_date'),
+            rating=F('film_work__rating'),
+            type=F('film_work__type'),
+        )
+
+
+def group_by_role(rows: list[dict]) -> list[dict]:
+    """
+    Собирает записи страницы, упорядоченные по роли, в группы по ролям.
+    """
+    groups = []
+    for row in rows:
+        role = row.pop('role')
+        if not groups or groups[-1]['role'] != role:
+            groups.append({'role': role, 'films': []})
+        groups[-1]['films'].append({'id': row.pop('film_work_id'), **row})
+    return groups
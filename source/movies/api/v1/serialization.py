@@ -0,0 +1,150 @@
+import functools
+import json
+from collections import UserList
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models.query import QuerySet
+from django.http import HttpResponse
+from movies.profiling import serialization_timer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+Encoder = Callable[[Any], bytes]
+
+
+def encode_stdlib(data) -> bytes:
+    """
+    Кодирует данные так же, как JsonResponse.
+    """
+    return json.dumps(data, cls=DjangoJSONEncoder).encode()
+
+
+def encode_default(value):
+    """
+    Приводит к JSON типы, которые быстрые кодировщики не знают.
+    Подклассы встроенных типов приводятся явно: например, ErrorList ошибок формы
+    наследует list, но хранит элементы в атрибуте data.
+    """
+    if isinstance(value, UserList):
+        return list(value)
+    for base_type in (str, list, dict):
+        if isinstance(value, base_type):
+            return base_type(value)
+    return DjangoJSONEncoder().default(value)
+
+
+def make_orjson_encoder() -> Encoder:
+    # UUID, дату и время orjson кодирует сам. OPT_UTC_Z записывает часовой пояс UTC
+    # как 'Z', как и DjangoJSONEncoder, а подклассы встроенных типов передаются в encode_default.
+    return functools.partial(
+        orjson.dumps,
+        default=encode_default,
+        option=orjson.OPT_UTC_Z | orjson.OPT_PASSTHROUGH_SUBCLASS,
+    )
+
+
+def make_msgspec_encoder() -> Encoder:
+    return msgspec.json.Encoder(enc_hook=encode_default).encode
+
+
+def get_available_encoders() -> dict[str, Encoder]:
+    """
+    Возвращает кодировщики, доступные в окружении, от быстрого к медленному.
+    orjson и msgspec - необязательные зависимости.
+    """
+    encoders = {}
+    if orjson is not None:
+        encoders['orjson'] = make_orjson_encoder()
+    if msgspec is not None:
+        encoders['msgspec'] = make_msgspec_encoder()
+    encoders['stdlib'] = encode_stdlib
+    return encoders
+
+
+@functools.cache
+def get_encoder(name: str) -> Encoder:
+    """
+    Возвращает кодировщик по имени из MOVIES_API_JSON_ENCODER.
+    'auto' выбирает самый быстрый из установленных.
+    """
+    encoders = get_available_encoders()
+    if name == 'auto':
+        return next(iter(encoders.values()))
+    if name not in encoders:
+        raise ValueError(f'JSON encoder {name} is not installed.')
+    return encoders[name]
+
+
+class RawJSON:
+    """
+    Готовый JSON, который вставляется в ответ как есть, без разбора и повторного кодирования.
+    """
+
+    def __init__(self, value: bytes):
+        self.value = value
+
+
+def dumps(data) -> bytes:
+    """
+    Кодирует данные ответа. Значения RawJSON на верхнем уровне словаря
+    (и сам ответ, если он RawJSON) подставляются байтами без изменений.
+    """
+    encode = get_encoder(settings.MOVIES_API_JSON_ENCODER)
+    if isinstance(data, RawJSON):
+        return data.value
+    if not isinstance(data, dict) or not any(
+        isinstance(value, RawJSON) for value in data.values()
+    ):
+        return encode(data)
+
+    parts = [
+        encode(key)
+        + b':'
+        + (value.value if isinstance(value, RawJSON) else encode(value))
+        for key, value in data.items()
+    ]
+    return b'{' + b','.join(parts) + b'}'
+
+
+def json_response(data, status: int = 200) -> HttpResponse:
+    with serialization_timer():
+        content = dumps(data)
+    return HttpResponse(content, status=status, content_type='application/json')
+
+
+def fetch_json_array(query_set: QuerySet) -> RawJSON:
+    """
+    Выполняет запрос так, что PostgreSQL сам собирает его строки в JSON-массив объектов.
+    Ключи объектов - имена колонок выборки values(). Порядок элементов совпадает
+    с порядком строк подзапроса: json_agg получает их уже отсортированными.
+    """
+    sql, params = query_set.query.sql_with_params()
+    with connections[query_set.db].cursor() as cursor:
+        cursor.execute(
+            f"SELECT coalesce(json_agg(page), '[]')::text FROM ({sql}) AS page",
+            params,
+        )
+        return RawJSON(cursor.fetchone()[0].encode())
+
+
+def fetch_json_object(query_set: QuerySet) -> RawJSON | None:
+    """
+    Возвращает первую строку выборки в виде JSON-объекта, построенного PostgreSQL,
+    или None, если выборка пуста.
+    """
+    sql, params = query_set.query.sql_with_params()
+    with connections[query_set.db].cursor() as cursor:
+        cursor.execute(f'SELECT row_to_json(row)::text FROM ({sql}) AS row', params)
+        result = cursor.fetchone()
+    return RawJSON(result[0].encode()) if result else None
@@ -1,7 +1,23 @@
+from django.conf import settings
 from django.urls import path
-from movies.api.v1.views import MoviesDetailApi, MoviesListApi
+from movies.api.v1 import async_views, persons, views
+
+# Под ASGI (gunicorn.conf.py) API обслуживают асинхронные представления,
+# под uWSGI - синхронные, см. MOVIES_API_ASYNC.
+if settings.MOVIES_API_ASYNC:
+    list_view = async_views.AsyncMoviesListApi
+    export_view = async_views.AsyncMoviesExportApi
+    detail_view = async_views.AsyncMoviesDetailApi
+else:
+    list_view = views.MoviesListApi
+    export_view = views.MoviesExportApi
+    detail_view = views.MoviesDetailApi
 
 urlpatterns = [
-    path('movies/', MoviesListApi.as_view()),
-    path('movies/<uuid:pk>/', MoviesDetailApi.as_view()),
+    path('movies/', list_view.as_view()),
+    path('movies/export/', export_view.as_view()),
+    path('movies/changes/', views.MoviesChangesApi.as_view()),
+    path('movies/<uuid:pk>/', detail_view.as_view()),
+    path('persons/<uuid:pk>/', persons.PersonsDetailApi.as_view()),
+    path('persons/<uuid:pk>/films/', persons.PersonFilmsApi.as_view()),
 ]
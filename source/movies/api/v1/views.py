@@ -1,88 +1,475 @@
-from django.contrib.postgres.aggregates import ArrayAgg
-from django.db.models import OuterRef, Q, Subquery
-from django.db.models.functions import Coalesce
+import datetime
+import functools
+
+from django.conf import settings
+from django.contrib.postgres.expressions import ArraySubquery
+from django.contrib.postgres.fields import ArrayField
+from django.core.paginator import Page
+from django.db.models import Aggregate, Func, JSONField, OuterRef, Q, TextField
 from django.db.models.query import QuerySet
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.translation import gettext as _
 from django.views.generic.base import View
 from django.views.generic.detail import BaseDetailView
 from django.views.generic.list import BaseListView
-from movies.models import Filmwork, PersonFilmwork
+from movies.api.v1 import conditional, http_cache, serialization
+from movies.api.v1.cache import get_detail, set_detail
+from movies.api.v1.changes import get_changes, make_watermark, parse_watermark
+from movies.api.v1.counts import CountedPaginator, FilmworkCounter
+from movies.api.v1.export import iter_ndjson
+from movies.api.v1.filters import RESPONSE_FIELDS, MoviesFieldsForm, MoviesFilterForm
+from movies.api.v1.pagination import CursorPaginator, invalid_cursor_response
+from movies.models import Filmwork, FilmworkReadModel, GenreFilmwork, PersonFilmwork
+
+Roles = PersonFilmwork.PersonFilmworkRoles
+
+
+class JSONBObjectAgg(Aggregate):
+    function = 'JSONB_OBJECT_AGG'
+    output_field = JSONField()
+
+
+class JSONBValues(Func):
+    """
+    Массив значений объекта JSONB. Для NULL (агрегат без строк) - пустой массив.
+    """
+
+    # Функция стоит в списке выборки: агрегат внешнего запроса нельзя передать функции в FROM.
+    template = 'ARRAY(SELECT (jsonb_each_text(%(expressions)s)).value)'
+    output_field = ArrayField(TextField())
 
 
 class MoviesApiMixin(View):
     model = Filmwork
     http_method_names = ['get']
+    read_model_fields = RESPONSE_FIELDS
+    form_class = MoviesFieldsForm
+    # Данные читаются с реплик, если они настроены (config.routers.ReplicaRouter).
+    replica_reads = True
+
+    def get(self, request, *args, **kwargs):
+        """
+        Проверяет параметры запроса и отвечает 400, если они некорректны.
+        Отвечает 304 на условный запрос, если данные не менялись,
+        не выполняя основной запрос с агрегацией жанров и участников.
+        """
+        if (response := self.validate_params(request)) is not None:
+            return response
+        last_modified = self.get_last_modified()
+        if last_modified is None:
+            return self.get_full_response(request, *args, **kwargs)
+
+        etag = conditional.make_etag(request.get_full_path(), last_modified)
+        response = conditional.get_not_modified_response(request, etag, last_modified)
+        if response is None:
+            response = self.get_full_response(request, *args, **kwargs)
+        else:
+            # Ответ 304 не проходит через render_to_response, а nginx обновляет
+            # время жизни записи кэша по заголовкам ответа на перепроверку.
+            self.set_cache_headers(response)
+        return conditional.set_validators(response, etag, last_modified)
+
+    def validate_params(self, request) -> HttpResponse | None:
+        self.filter_form = self.form_class(request.GET)
+        if self.filter_form.is_valid():
+            return None
+        return serialization.json_response(
+            {'detail': self.filter_form.errors}, status=400
+        )
+
+    def get_full_response(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def get_last_modified(self):
+        """
+        Возвращает время последнего изменения данных ответа для заголовков ETag и Last-Modified.
+        """
+        read_model = settings.MOVIES_API_QUERY_ENGINE == 'read_model'
+        if record_id := self.kwargs.get('pk', None):
+            return conditional.get_film_last_modified(record_id, read_model)
+        return conditional.get_list_last_modified(read_model)
 
     def get_queryset(self) -> QuerySet:
         """
         Возвращает подготовленный Queryset в соответствии с запросом.
+        Жанры и участники, не запрошенные параметром fields, не агрегируются вовсе.
         """
-        if record_id := self.kwargs.get('pk', None):
-            query_set = self.model.objects.filter(id=record_id)
+        query_set = self.get_base_queryset()
+        fields = self.get_fields()
+        if settings.MOVIES_API_QUERY_ENGINE == 'read_model':
+            return query_set.values(*fields)
+        if settings.MOVIES_API_QUERY_ENGINE == 'join':
+            return self.annotate_with_joins(query_set, fields)
+        return self.annotate_with_subqueries(query_set, fields)
+
+    def get_fields(self) -> tuple[str, ...]:
+        """
+        Возвращает поля ответа из параметра fields, по умолчанию - все.
+        Без формы параметров (например, в командах управления) возвращает все поля.
+        """
+        if (filter_form := getattr(self, 'filter_form', None)) is None:
+            return self.read_model_fields
+        return filter_form.cleaned_data['fields'] or self.read_model_fields
+
+    def get_base_queryset(self) -> QuerySet:
+        """
+        Возвращает выборку фильмов без колонок с жанрами и участниками.
+        При чтении из витрины FilmworkReadModel эти колонки в ней уже есть.
+        """
+        if settings.MOVIES_API_QUERY_ENGINE == 'read_model':
+            model = FilmworkReadModel
         else:
-            query_set = self.model.objects
-
-        return query_set.values().annotate(
-            genres=self.get_genres_subquery(),
-            actors=self.get_persons_subquery(PersonFilmwork.PersonFilmworkRoles.ACTOR),
-            directors=self.get_persons_subquery(
-                PersonFilmwork.PersonFilmworkRoles.DIRECTOR
-            ),
-            writers=self.get_persons_subquery(
-                PersonFilmwork.PersonFilmworkRoles.WRITER
-            ),
+            model = self.model
+
+        if record_id := self.kwargs.get('pk', None):
+            return model.objects.filter(id=record_id)
+        return model.objects.all()
+
+    def annotate_with_subqueries(self, query_set, fields=None) -> QuerySet:
+        """
+        Добавляет к записям жанры и участников через коррелированные подзапросы.
+        """
+        return self.annotate_relations(
+            query_set,
+            fields,
+            {
+                'genres': self.get_genres_subquery,
+                'actors': functools.partial(self.get_persons_subquery, Roles.ACTOR),
+                'directors': functools.partial(
+                    self.get_persons_subquery, Roles.DIRECTOR
+                ),
+                'writers': functools.partial(self.get_persons_subquery, Roles.WRITER),
+            },
         )
 
-    def get_genres_subquery(self) -> Subquery:
+    def annotate_with_joins(self, query_set, fields=None) -> QuerySet:
         """
-        Возвращает объект класса Subquery c колонкой genres_.
-        Каждая запись в колонке содержит жанры для фильма из таблицы Filmwork.
+        Добавляет к записям жанры и участников за один проход LEFT JOIN
+        по GenreFilmwork и PersonFilmwork с группировкой по фильму.
+        Соединение жанров и участников перемножает строки фильма, поэтому имена
+        собираются по ID связей: повторы одной связи схлопываются, а разные жанры
+        и участники с одинаковыми именами остаются, как и в подзапросах.
         """
-        genres = self.model.objects.annotate(
-            genres_=Coalesce(ArrayAgg('genres__name'), [])
-        ).filter(pk=OuterRef('pk'))
-        return Subquery(genres.values('genres_'))
+        return self.annotate_relations(
+            query_set,
+            fields,
+            {
+                'genres': lambda: self.get_links_aggregate(
+                    'genrefilmwork', 'genre__name', Q(genrefilmwork__isnull=False)
+                ),
+                'actors': functools.partial(self.get_persons_aggregate, Roles.ACTOR),
+                'directors': functools.partial(
+                    self.get_persons_aggregate, Roles.DIRECTOR
+                ),
+                'writers': functools.partial(self.get_persons_aggregate, Roles.WRITER),
+            },
+        )
+
+    def annotate_relations(
+        self, query_set, fields: tuple[str, ...] | None, builders: dict
+    ) -> QuerySet:
+        """
+        Выбирает колонки fields (по умолчанию все) и добавляет запрошенные из них
+        жанры и участников. Выражения для незапрошенных не строятся, поэтому запрос
+        без них не содержит ни подзапросов, ни соединений со связями.
+        """
+        fields = fields or self.read_model_fields
+        columns = [field for field in fields if field not in builders]
+        annotations = {
+            field: build() for field, build in builders.items() if field in fields
+        }
+        return query_set.values(*columns).annotate(**annotations)
+
+    def get_genres_subquery(self) -> ArraySubquery:
+        """
+        Возвращает подзапрос с названиями жанров фильма.
+        Связи читаются из GenreFilmwork по индексу film_work_genre_idx без соединения с film_work.
+        """
+        genres = GenreFilmwork.objects.filter(film_work=OuterRef('pk'))
+        return ArraySubquery(genres.values('genre__name'))
 
     def get_persons_subquery(
         self, role: PersonFilmwork.PersonFilmworkRoles
-    ) -> Subquery:
+    ) -> ArraySubquery:
         """
-        Возвращает объект класса Subquery c колонкой genres_.
-        Каждая запись в колонке содержит жанры для фильма из таблицы Filmwork.
+        Возвращает подзапрос с именами участников фильма в указанной роли.
+        Связи читаются из PersonFilmwork по индексу film_work_person_role_idx
+        без соединения с film_work.
         """
-        persons = self.model.objects.annotate(
-            roles=Coalesce(
-                ArrayAgg(
-                    'persons__full_name',
-                    filter=Q(personfilmwork__role=role),
-                ),
-                [],
-            )
-        ).filter(pk=OuterRef('pk'))
+        persons = PersonFilmwork.objects.filter(film_work=OuterRef('pk'), role=role)
+        return ArraySubquery(persons.values('person__full_name'))
 
-        return Subquery(persons.values('roles'))
+    def get_persons_aggregate(
+        self, role: PersonFilmwork.PersonFilmworkRoles
+    ) -> JSONBValues:
+        """
+        Возвращает агрегат с именами участников фильма в указанной роли
+        для запроса с группировкой по фильму.
+        """
+        return self.get_links_aggregate(
+            'personfilmwork', 'person__full_name', Q(personfilmwork__role=role)
+        )
+
+    def get_links_aggregate(self, link: str, name: str, condition: Q) -> JSONBValues:
+        """
+        Возвращает массив имен из связей link, отобранных condition, по одному на связь.
+        Объект {ID связи: имя} хранит каждую связь один раз, сколько бы раз
+        ее строка ни повторилась в соединении.
+        """
+        return JSONBValues(
+            JSONBObjectAgg(f'{link}__id', f'{link}__{name}', filter=condition)
+        )
 
     def render_to_response(self, context, **response_kwargs):
-        return JsonResponse(context)
+        return self.set_cache_headers(serialization.json_response(context))
+
+    def set_cache_headers(self, response: HttpResponse) -> HttpResponse:
+        return http_cache.set_cache_headers(response, self.get_surrogate_keys())
+
+    def get_surrogate_keys(self) -> list[str]:
+        if record_id := self.kwargs.get('pk', None):
+            return [http_cache.get_film_surrogate_key(record_id)]
+        ids = self.filter_form.cleaned_data.get('ids') or []
+        return [
+            http_cache.LIST_SURROGATE_KEY,
+            *(http_cache.get_film_surrogate_key(film_id) for film_id in ids),
+        ]
 
 
 class MoviesListApi(MoviesApiMixin, BaseListView):
     paginate_by = 50
+    form_class = MoviesFilterForm
+    # Параметры запроса, отвечающие за навигацию и порядок, а не за состав выборки.
+    pagination_params = ('page', 'pagination', 'cursor', 'sort', 'ids')
+
+    def validate_params(self, request) -> HttpResponse | None:
+        """
+        Дополнительно к параметрам формы проверяет курсор: он разбирается
+        без обращения к БД, поэтому поврежденный курсор отклоняется до запросов.
+        """
+        response = super().validate_params(request)
+        cursor = request.GET.get('cursor')
+        if response is None and cursor and self.is_cursor_pagination():
+            try:
+                self.get_cursor_paginator(self.get_queryset()).decode(cursor)
+            except ValueError:
+                response = invalid_cursor_response()
+        return response
+
+    def get_queryset(self) -> QuerySet:
+        return super().get_queryset().order_by(*self.get_ordering())
+
+    def get_base_queryset(self) -> QuerySet:
+        return self.filter_form.apply(super().get_base_queryset())
+
+    def get_ordering(self) -> tuple[str, ...]:
+        """
+        Возвращает порядок записей из параметра sort. Он же служит ключом курсора.
+        """
+        return self.filter_form.get_ordering()
+
+    def get_fields(self) -> tuple[str, ...]:
+        """
+        Курсор строится по значениям ключа сортировки, поэтому в режиме курсора
+        поля сортировки выбираются, даже если не запрошены.
+        """
+        fields = super().get_fields()
+        if not self.is_cursor_pagination():
+            return fields
+        ordering = {field.lstrip('-') for field in self.get_ordering()}
+        return tuple(
+            field
+            for field in self.read_model_fields
+            if field in fields or field in ordering
+        )
 
     def get_context_data(self, *, object_list=None, **kwargs):
         queryset = self.get_queryset()
+        if ids := self.filter_form.cleaned_data['ids']:
+            return self.get_batch_context_data(ids, queryset.filter(id__in=ids))
+        if self.is_cursor_pagination():
+            return self.get_cursor_context_data(queryset)
+
         paginator, page, queryset, is_paginated = self.paginate_queryset(
             queryset, self.paginate_by
         )
+        return self.get_page_context_data(
+            paginator, page, self.get_page_results(queryset)
+        )
+
+    def get_page_results(self, queryset: QuerySet) -> list | serialization.RawJSON:
+        """
+        Возвращает записи страницы. При MOVIES_API_DB_JSON их JSON собирает PostgreSQL.
+        """
+        if settings.MOVIES_API_DB_JSON:
+            return serialization.fetch_json_array(queryset)
+        return list(queryset)
+
+    def get_batch_context_data(self, ids: list, rows) -> dict:
+        """
+        Возвращает карточки фильмов по списку ID, полученные одним запросом, в порядке запроса.
+        На месте отсутствующих фильмов (или не прошедших фильтры) стоит null,
+        а их ID перечислены в missing.
+        """
+        films = {row['id']: row for row in rows}
+        return {
+            'results': [films.get(film_id) for film_id in ids],
+            'missing': [
+                film_id for film_id in dict.fromkeys(ids) if film_id not in films
+            ],
+        }
+
+    def get_paginator(
+        self,
+        queryset,
+        per_page,
+        orphans=0,
+        allow_empty_first_page=True,
+        **kwargs,
+    ) -> CountedPaginator:
+        counter = FilmworkCounter(self.get_base_queryset(), self.get_filters())
+        return CountedPaginator(
+            queryset,
+            per_page,
+            counter,
+            orphans=orphans,
+            allow_empty_first_page=allow_empty_first_page,
+            **kwargs,
+        )
+
+    def get_page_context_data(
+        self, paginator: CountedPaginator, page: Page, results: list
+    ) -> dict:
         return {
             'count': paginator.count,
+            'count_exact': paginator.counter.exact,
             'total_pages': paginator.num_pages,
             'prev': page.previous_page_number() if page.has_previous() else None,
             'next': page.next_page_number() if page.has_next() else None,
-            'results': list(queryset),
+            'results': results,
         }
 
+    def get_filters(self) -> dict:
+        """
+        Возвращает параметры запроса, влияющие на состав выборки.
+        """
+        return {
+            key: self.request.GET.getlist(key)
+            for key in self.request.GET
+            if key not in self.pagination_params
+        }
+
+    def is_cursor_pagination(self) -> bool:
+        """
+        Навигация по курсору включается параметром pagination=cursor
+        или передачей курсора, полученного в предыдущем ответе.
+        """
+        return (
+            self.request.GET.get('pagination') == 'cursor'
+            or 'cursor' in self.request.GET
+        )
+
+    def get_cursor_context_data(self, queryset: QuerySet) -> dict:
+        """
+        Возвращает страницу, найденную по курсору, без подсчета общего количества записей.
+        Курсор уже проверен в validate_params.
+        """
+        results, next_cursor, prev_cursor = self.get_cursor_paginator(
+            queryset
+        ).paginate(self.request.GET.get('cursor'))
+        return {'prev': prev_cursor, 'next': next_cursor, 'results': results}
+
+    def get_cursor_paginator(self, queryset: QuerySet) -> CursorPaginator:
+        return CursorPaginator(queryset, self.paginate_by, self.get_ordering())
+
 
 class MoviesDetailApi(MoviesApiMixin, BaseDetailView):
+    def get_full_response(self, request, *args, **kwargs):
+        """
+        Отдает карточку фильма из кэша, а при промахе строит ее и сохраняет в кэш.
+        В кэше хранятся только полные карточки, выборка полей (fields) строится заново.
+        """
+        if self.filter_form.cleaned_data['fields']:
+            return super().get_full_response(request, *args, **kwargs)
+        if (payload := get_detail(self.kwargs['pk'])) is not None:
+            return self.render_to_response(serialization.RawJSON(payload))
+
+        response = super().get_full_response(request, *args, **kwargs)
+        set_detail(self.kwargs['pk'], response.content)
+        return response
+
+    def get_object(self, queryset=None):
+        """
+        При MOVIES_API_DB_JSON возвращает карточку фильма в виде JSON, построенного PostgreSQL.
+        """
+        if not settings.MOVIES_API_DB_JSON:
+            return super().get_object(queryset)
+        queryset = self.get_queryset() if queryset is None else queryset
+        if (film := serialization.fetch_json_object(queryset)) is None:
+            raise Http404(
+                _('No %(verbose_name)s found matching the query')
+                % {'verbose_name': queryset.model._meta.verbose_name}
+            )
+        return film
+
     def get_context_data(self, *, object_list=None, **kwargs):
-        return self.get_queryset()[0]
+        # get_object уже выполнил запрос с аннотациями и вернул словарь с полями фильма.
+        return self.object
+
+
+class MoviesExportApi(MoviesApiMixin):
+    """
+    Потоковая выгрузка всего каталога в NDJSON, по одному фильму в строке.
+    """
+
+    chunk_size = 2000
+
+    def get_queryset(self) -> QuerySet:
+        # Выгрузка читается при отправке ответа, уже после выхода из ReplicaRoutingMiddleware,
+        # поэтому база для чтения выбирается заранее.
+        query_set = super().get_queryset()
+        return query_set.using(query_set.db)
+
+    def get_full_response(self, request, *args, **kwargs):
+        return StreamingHttpResponse(
+            iter_ndjson(self.get_queryset(), self.chunk_size),
+            content_type='application/x-ndjson',
+        )
+
+
+class MoviesChangesApi(View):
+    """
+    Лента изменений для ETL: ID фильмов, измененных или удаленных после водяного знака,
+    по возрастанию (время изменения, ID) и новый водяной знак для следующего запроса.
+    Лента читается с основной базы: на отстающей реплике клиент перешагнул бы водяным знаком
+    через изменения, которые еще не доехали.
+    """
+
+    http_method_names = ['get']
+
+    def get(self, request, *args, **kwargs):
+        try:
+            since, after_id = parse_watermark(
+                request.GET.get('since'), request.GET.get('watermark')
+            )
+        except ValueError as error:
+            return serialization.json_response({'detail': str(error)}, status=400)
+
+        page_size = settings.MOVIES_CHANGES_PAGE_SIZE
+        lag = datetime.timedelta(seconds=settings.MOVIES_CHANGES_SAFETY_LAG)
+        rows = get_changes(since, after_id, page_size + 1, lag)
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if rows:
+            after_id, since = rows[-1][:2]
+
+        return serialization.json_response(
+            {
+                'watermark': make_watermark(since, after_id),
+                'has_more': has_more,
+                'results': [
+                    {'id': film_id, 'modified': changed_at, 'deleted': deleted}
+                    for film_id, changed_at, deleted in rows
+                ],
+            }
+        )
@@ -0,0 +1,144 @@
+import http.client
+import statistics
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+
+def percentile(samples: list[float], rank: float) -> float:
+    """
+    Возвращает перцентиль rank (от 0 до 100) выборки методом ближайшего ранга.
+    """
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(rank / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples: list[float]) -> dict:
+    """
+    Возвращает сводку по выборке длительностей в миллисекундах.
+    """
+    return {
+        'runs': len(samples),
+        'mean_ms': statistics.fmean(samples),
+        'p50_ms': percentile(samples, 50),
+        'p95_ms': percentile(samples, 95),
+        'p99_ms': percentile(samples, 99),
+        'max_ms': max(samples),
+    }
+
+
+def measure(func: Callable, iterations: int, warmup: int = 1) -> dict:
+    """
+    Выполняет func заданное количество раз и возвращает сводку по длительности вызовов.
+    Первые warmup вызовов не учитываются, чтобы прогреть кэши и соединение с БД.
+    """
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return summarize(samples)
+
+
+def read_rss(pids: list[int]) -> int:
+    """
+    Возвращает суммарный резидентный объем памяти процессов в байтах.
+    """
+    return sum(read_process_rss(pid) for pid in pids)
+
+
+def read_process_rss(pid: int) -> int:
+    """
+    Читает VmRSS процесса из /proc/<pid>/status.
+    Для завершившегося процесса (например, перезапущенного воркера) возвращает 0.
+    """
+    try:
+        with open(f'/proc/{pid}/status', encoding='ascii') as status:
+            lines = status.readlines()
+    except FileNotFoundError:
+        return 0
+    for line in lines:
+        if line.startswith('VmRSS:'):
+            return int(line.split()[1]) * 1024
+    return 0
+
+
+class RssSampler(threading.Thread):
+    """
+    Фоновый поток, запоминающий пиковый объем памяти процессов сервера во время нагрузки.
+    """
+
+    def __init__(self, pids: list[int], interval: float = 0.05):
+        super().__init__(daemon=True)
+        self.pids = pids
+        self.interval = interval
+        self.peak = read_rss(pids)
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.peak = max(self.peak, read_rss(self.pids))
+
+    def stop(self) -> int:
+        self.stopped.set()
+        self.join()
+        return self.peak
+
+
+def fetch(url: str, timeout: float) -> tuple[float, bool]:
+    """
+    Выполняет GET и возвращает длительность в миллисекундах и признак успешного ответа.
+    """
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            response.read()
+            succeeded = response.status == 200
+    except (OSError, http.client.HTTPException):
+        succeeded = False
+    return (time.perf_counter() - started) * 1000, succeeded
+
+
+def run_load(urls: list[str], concurrency: int, timeout: float) -> dict:
+    """
+    Запрашивает urls, держа concurrency запросов в полете одновременно,
+    и возвращает сводку по длительности запросов, пропускную способность и число ошибок.
+    """
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda url: fetch(url, timeout), urls))
+    elapsed = time.perf_counter() - started
+
+    summary = summarize([duration for duration, _ in results])
+    summary['rps'] = len(results) / elapsed
+    summary['errors'] = sum(1 for _, succeeded in results if not succeeded)
+    return summary
+
+
+def measure_requests(client, urls: list[str]) -> dict:
+    """
+    Последовательно запрашивает urls тестовым клиентом Django (весь стек middleware,
+    без HTTP-сервера) и возвращает сводку по длительности, пропускную способность
+    и число ответов со статусом, отличным от 200. Первый запрос прогревает кэши и не учитывается.
+    """
+    client.get(urls[0])
+    samples = []
+    errors = 0
+    started = time.perf_counter()
+    for url in urls:
+        request_started = time.perf_counter()
+        response = client.get(url)
+        samples.append((time.perf_counter() - request_started) * 1000)
+        errors += response.status_code != 200
+    elapsed = time.perf_counter() - started
+
+    summary = summarize(samples)
+    summary['rps'] = len(samples) / elapsed
+    summary['errors'] = errors
+    return summary
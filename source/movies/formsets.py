@@ -0,0 +1,185 @@
+from urllib.parse import urlencode
+
+from django.core.paginator import Page, Paginator
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.query import QuerySet
+from django.forms.models import BaseInlineFormSet
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from movies.models import PersonFilmwork
+from movies.signals import evict_details_on_commit, invalidate_counts_on_commit
+
+
+class CrewInlineFormSet(BaseInlineFormSet):
+    """
+    Формсет участников фильма для админки.
+    Выводит одну страницу связей с поиском по имени участника и фильтром по роли,
+    а при сохранении записывает только измененные строки массовыми запросами.
+    Запрос передается классу формсета в PersonFilmworkInline.get_formset.
+    """
+
+    request = None
+    per_page = 50
+    page_param = 'crew_page'
+    query_param = 'crew_q'
+    role_param = 'crew_role'
+
+    def __init__(self, *args, **kwargs):
+        self.page: Page | None = None
+        super().__init__(*args, **kwargs)
+
+    def save(self, commit=True):
+        """
+        Разбирает формы на добавленные, измененные и удаленные связи
+        и сохраняет их тремя массовыми запросами вместо запроса на каждую строку.
+        """
+        if not commit:
+            return super().save(commit=False)
+
+        self.collect_changes()
+        with transaction.atomic():
+            self.bulk_save()
+        return self.new_objects + [instance for instance, _ in self.changed_objects]
+
+    @property
+    def params(self):
+        return self.request.GET if self.request is not None else {}
+
+    @property
+    def query(self) -> str:
+        return self.params.get(self.query_param, '').strip()
+
+    def clean(self):
+        """
+        Формсет проверяет уникальность (участник, роль) только среди форм текущей страницы,
+        поэтому связь, повторяющая строку другой страницы, проверяется по БД одним запросом.
+        """
+        super().clean()
+        forms = {
+            (form.cleaned_data['person'].pk, form.cleaned_data['role']): form
+            for form in self.forms
+            if form.has_changed()
+            and not self._should_delete_form(form)
+            and form.cleaned_data.get('person') is not None
+            and form.cleaned_data.get('role')
+        }
+        if not forms or self.instance._state.adding:
+            return
+
+        conditions = Q()
+        for person_id, role in forms:
+            conditions |= Q(person_id=person_id, role=role)
+        page_ids = [form.instance.pk for form in self.initial_forms]
+        duplicates = (
+            self.model.objects.filter(conditions, film_work=self.instance)
+            .exclude(pk__in=page_ids)
+            .values_list('person_id', 'role')
+        )
+        for key in duplicates:
+            forms[key].add_error(
+                'person', _('This person already has this role in the film work.')
+            )
+
+    def get_queryset(self) -> QuerySet:
+        """
+        Возвращает связи текущей страницы. POST отправляется на тот же URL,
+        поэтому при сохранении формы сопоставляются с той же страницей.
+        """
+        if self.page is None:
+            query_set = self.filter_queryset(super().get_queryset())
+            paginator = Paginator(query_set, self.per_page)
+            self.page = paginator.get_page(self.params.get(self.page_param))
+            self._queryset = self.page.object_list
+        return self._queryset
+
+    def filter_queryset(self, query_set: QuerySet) -> QuerySet:
+        if self.query:
+            query_set = query_set.filter(person__full_name__icontains=self.query)
+        if role := self.params.get(self.role_param):
+            query_set = query_set.filter(role=role)
+        return query_set.select_related('person').order_by('person__full_name', 'id')
+
+    def get_url(self, **params) -> str:
+        """
+        Возвращает строку запроса текущей страницы с замененными параметрами навигации.
+        """
+        query = {key: value for key, value in self.params.items() if value}
+        query.update(params)
+        return '?' + urlencode({key: value for key, value in query.items() if value})
+
+    def get_page_links(self) -> list[tuple[int | str, str | None]]:
+        """
+        Возвращает номера страниц со ссылками. У текущей страницы и пропусков ссылки нет.
+        """
+        self.get_queryset()
+        links = []
+        for number in self.page.paginator.get_elided_page_range(self.page.number):
+            if number == self.page.number or number == Paginator.ELLIPSIS:
+                links.append((number, None))
+            else:
+                links.append((number, self.get_url(**{self.page_param: number})))
+        return links
+
+    def get_role_links(self) -> list[tuple[str, str, bool]]:
+        current = self.params.get(self.role_param, '')
+        choices = [('', '—'), *PersonFilmwork.PersonFilmworkRoles.choices]
+        return [
+            (
+                label,
+                self.get_url(**{self.role_param: value, self.page_param: ''}),
+                value == current,
+            )
+            for value, label in choices
+        ]
+
+    def collect_changes(self):
+        """
+        Заполняет new_objects, changed_objects и deleted_objects, как это делает save формсета.
+        По ним админка составляет сообщение в журнале изменений.
+        """
+        self.new_objects = [
+            form.instance
+            for form in self.extra_forms
+            if form.has_changed() and not self._should_delete_form(form)
+        ]
+        initial_forms = [
+            form for form in self.initial_forms if form.instance.pk is not None
+        ]
+        self.deleted_objects = [
+            form.instance for form in initial_forms if self._should_delete_form(form)
+        ]
+        self.changed_objects = [
+            (form.instance, form.changed_data)
+            for form in initial_forms
+            if form.has_changed() and not self._should_delete_form(form)
+        ]
+
+    def bulk_save(self):
+        """
+        bulk_create и bulk_update не отправляют сигналы моделей,
+        поэтому кэш карточки фильма и количества фильмов сбрасываются явно.
+        Удаление выполняется одним DELETE, но с сигналами post_delete,
+        которые отмечают изменение у фильма.
+        """
+        if self.deleted_objects:
+            deleted_ids = [instance.pk for instance in self.deleted_objects]
+            self.model.objects.filter(pk__in=deleted_ids).delete()
+
+        if self.changed_objects:
+            now = timezone.now()
+            model_fields = {field.name for field in self.model._meta.concrete_fields}
+            fields = {'modified'}
+            for instance, changed_data in self.changed_objects:
+                instance.modified = now
+                fields.update(model_fields.intersection(changed_data))
+            self.model.objects.bulk_update(
+                [instance for instance, _ in self.changed_objects], sorted(fields)
+            )
+
+        if self.new_objects:
+            self.model.objects.bulk_create(self.new_objects)
+
+        if self.new_objects or self.changed_objects:
+            evict_details_on_commit([self.instance.pk])
+            invalidate_counts_on_commit()
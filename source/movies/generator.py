@@ -0,0 +1,187 @@
+import contextlib
+import csv
+import datetime
+import itertools
+import random
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from faker import Faker
+from movies.models import Filmwork, PersonFilmwork
+
+GENRES = (
+    'Drama',
+    'Comedy',
+    'Action',
+    'Thriller',
+    'Romance',
+    'Documentary',
+    'Horror',
+    'Crime',
+    'Adventure',
+    'Family',
+    'Animation',
+    'Sci-Fi',
+    'Fantasy',
+    'Mystery',
+    'Biography',
+    'History',
+    'Music',
+    'War',
+    'Sport',
+    'Western',
+    'Musical',
+    'Short',
+    'Film-Noir',
+    'News',
+    'Reality-TV',
+)
+
+Roles = PersonFilmwork.PersonFilmworkRoles
+
+# Файлы каталога и их колонки в формате команды load_content.
+COLUMNS = {
+    'genres': ['id', 'name', 'description'],
+    'persons': ['id', 'full_name'],
+    'films': ['id', 'title', 'description', 'creation_date', 'rating', 'type'],
+    'genre_film_work': ['film_work_id', 'genre_id'],
+    'person_film_work': ['film_work_id', 'person_id', 'role'],
+}
+
+
+@dataclass(frozen=True)
+class CatalogueShape:
+    """
+    Параметры распределений генерируемого каталога.
+    """
+
+    films: int
+    persons: int
+    # Показатель распределения Парето для размера состава: чем меньше, тем тяжелее хвост.
+    cast_alpha: float = 1.3
+    min_cast: int = 3
+    max_cast: int = 300
+    # Показатели закона Ципфа для популярности участников и жанров.
+    person_skew: float = 1.1
+    genre_skew: float = 1.2
+    tv_show_share: float = 0.2
+
+
+def get_zipf_weights(size: int, skew: float) -> list[float]:
+    """
+    Возвращает накопленные веса закона Ципфа для random.choices(cum_weights=...).
+    """
+    return list(itertools.accumulate(1 / rank**skew for rank in range(1, size + 1)))
+
+
+class CatalogueGenerator:
+    """
+    Генерирует каталог с перекосами реальных данных: размер состава фильма распределен
+    по Парето (у большинства фильмов несколько участников, у единиц - сотни),
+    а участники и жанры выбираются по закону Ципфа (немногие встречаются в огромном числе фильмов).
+    Результат записывается в CSV-файлы в формате команды load_content.
+    """
+
+    def __init__(self, shape: CatalogueShape, seed: int):
+        self.shape = shape
+        self.randomizer = random.Random(seed)
+        self.faker = Faker()
+        self.faker.seed_instance(seed)
+        self.genre_ids = [self.make_id() for _ in GENRES]
+        self.person_ids = [self.make_id() for _ in range(shape.persons)]
+        self.genre_weights = get_zipf_weights(len(GENRES), shape.genre_skew)
+        self.person_weights = get_zipf_weights(shape.persons, shape.person_skew)
+
+    def make_id(self) -> uuid.UUID:
+        # UUID из генератора с зерном, чтобы каталог воспроизводился от запуска к запуску.
+        return uuid.UUID(int=self.randomizer.getrandbits(128), version=4)
+
+    def write(self, directory: Path) -> dict[str, Path]:
+        """
+        Записывает каталог в directory и возвращает пути файлов по видам данных.
+        Фильмы и их связи пишутся потоком, поэтому память не зависит от размера каталога.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = {name: directory / f'{name}.csv' for name in COLUMNS}
+        with contextlib.ExitStack() as stack:
+            writers = {}
+            for name, columns in COLUMNS.items():
+                output = stack.enter_context(
+                    paths[name].open('w', encoding='utf-8', newline='')
+                )
+                writers[name] = csv.writer(output)
+                writers[name].writerow(columns)
+
+            writers['genres'].writerows(self.iter_genres())
+            writers['persons'].writerows(self.iter_persons())
+            for film in self.iter_films():
+                writers['films'].writerow(film)
+                writers['genre_film_work'].writerows(
+                    [film[0], genre_id] for genre_id in self.choose_genres()
+                )
+                writers['person_film_work'].writerows(
+                    [film[0], person_id, role] for person_id, role in self.choose_crew()
+                )
+        return paths
+
+    def iter_genres(self) -> Iterator[list]:
+        for genre_id, name in zip(self.genre_ids, GENRES):
+            yield [genre_id, name, f'{name} films.']
+
+    def iter_persons(self) -> Iterator[list]:
+        """
+        Генерирует участников с уникальными именами: load_content сливает
+        участников с одинаковым нормализованным именем в одну запись.
+        """
+        names = set()
+        for person_id in self.person_ids:
+            name = self.faker.name()
+            while name.lower() in names:
+                name = (
+                    f'{self.faker.first_name()} {self.faker.last_name()}-{len(names)}'
+                )
+            names.add(name.lower())
+            yield [person_id, name]
+
+    def iter_films(self) -> Iterator[list]:
+        today = datetime.date.today()
+        for _ in range(self.shape.films):
+            # Новых фильмов больше, чем старых.
+            age = int(self.randomizer.expovariate(1 / 3000))
+            yield [
+                self.make_id(),
+                self.faker.sentence(nb_words=self.randomizer.randint(1, 5))[:-1],
+                self.faker.paragraph(nb_sentences=3),
+                today - datetime.timedelta(days=min(age, 36_500)),
+                round(min(100.0, max(0.0, self.randomizer.gauss(62, 15))), 1),
+                self.choose_type(),
+            ]
+
+    def choose_genres(self) -> set[uuid.UUID]:
+        return set(
+            self.randomizer.choices(
+                self.genre_ids,
+                cum_weights=self.genre_weights,
+                k=self.randomizer.randint(1, 3),
+            )
+        )
+
+    def choose_crew(self) -> set[tuple[uuid.UUID, str]]:
+        """
+        Возвращает состав фильма: режиссера, одного-двух сценаристов и актеров.
+        """
+        tail = self.randomizer.paretovariate(self.shape.cast_alpha)
+        cast_size = min(self.shape.max_cast, int(self.shape.min_cast * tail))
+        roles = [Roles.DIRECTOR, *[Roles.WRITER] * self.randomizer.randint(1, 2)]
+        roles.extend([Roles.ACTOR] * cast_size)
+        persons = self.randomizer.choices(
+            self.person_ids, cum_weights=self.person_weights, k=len(roles)
+        )
+        return {(person_id, role.value) for person_id, role in zip(persons, roles)}
+
+    def choose_type(self) -> str:
+        if self.randomizer.random() < self.shape.tv_show_share:
+            return Filmwork.FilmworkTypes.TV_SHOW.value
+        return Filmwork.FilmworkTypes.MOVIE.value
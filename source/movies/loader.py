@@ -0,0 +1,270 @@
+import csv
+import io
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from django.db import connection
+
+from movies import models
+
+
+@dataclass(frozen=True)
+class Source:
+    """
+    Вид загружаемых данных: колонки промежуточной таблицы и запрос переноса из нее в целевую.
+    """
+
+    name: str
+    columns: dict[str, str]
+    required: tuple[str, ...]
+    upsert_sql: str
+
+
+# Фильмы и жанры обновляются по первичному ключу, а modified меняется,
+# только если данные записи действительно изменились, чтобы не будить ленту изменений.
+# Участники сопоставляются по нормализованному имени (person_normalized_name_idx): новые вставляются,
+# а связи участника из файла переносятся на уже существующую запись с тем же именем.
+# Связи вставляются с ON CONFLICT DO NOTHING по уникальным ограничениям film_work_genre_idx
+# и film_work_person_role_idx, связи с несуществующими фильмами, жанрами и участниками пропускаются.
+SOURCES = (
+    Source(
+        name='genres',
+        columns={'id': 'uuid', 'name': 'text', 'description': 'text'},
+        required=('id', 'name'),
+        upsert_sql="""
+            INSERT INTO {genre} AS target (id, name, description, created, modified)
+            SELECT DISTINCT ON (id) id, name, coalesce(description, ''), now(), now()
+            FROM {staging}
+            ORDER BY id
+            ON CONFLICT (id) DO UPDATE
+            SET name = EXCLUDED.name, description = EXCLUDED.description, modified = now()
+            WHERE (target.name, target.description)
+                IS DISTINCT FROM (EXCLUDED.name, EXCLUDED.description)
+        """,
+    ),
+    Source(
+        name='persons',
+        columns={'id': 'uuid', 'full_name': 'text'},
+        required=('id', 'full_name'),
+        upsert_sql="""
+            INSERT INTO {person} (id, full_name, created, modified)
+            SELECT DISTINCT ON ({normalized_name}) id, full_name, now(), now()
+            FROM {staging}
+            ORDER BY {normalized_name}, id
+            ON CONFLICT DO NOTHING
+        """,
+    ),
+    Source(
+        name='films',
+        columns={
+            'id': 'uuid',
+            'title': 'text',
+            'description': 'text',
+            'creation_date': 'date',
+            'rating': 'double precision',
+            'type': 'text',
+        },
+        required=('id', 'title', 'creation_date', 'rating'),
+        upsert_sql="""
+            INSERT INTO {film_work} AS target
+                (id, title, description, creation_date, rating, type, created, modified)
+            SELECT DISTINCT ON (id)
+                id, title, coalesce(description, ''), creation_date, rating,
+                coalesce(type, 'movie'), now(), now()
+            FROM {staging}
+            ORDER BY id
+            ON CONFLICT (id) DO UPDATE
+            SET title = EXCLUDED.title,
+                description = EXCLUDED.description,
+                creation_date = EXCLUDED.creation_date,
+                rating = EXCLUDED.rating,
+                type = EXCLUDED.type,
+                modified = now()
+            WHERE (target.title, target.description, target.creation_date, target.rating, target.type)
+                IS DISTINCT FROM
+                (EXCLUDED.title, EXCLUDED.description, EXCLUDED.creation_date, EXCLUDED.rating, EXCLUDED.type)
+        """,
+    ),
+    Source(
+        name='genre_film_work',
+        columns={'id': 'uuid', 'film_work_id': 'uuid', 'genre_id': 'uuid'},
+        required=('film_work_id', 'genre_id'),
+        upsert_sql="""
+            INSERT INTO {genre_film_work} (id, film_work_id, genre_id, created, modified)
+            SELECT coalesce(staging.id, gen_random_uuid()), staging.film_work_id, staging.genre_id, now(), now()
+            FROM {staging} AS staging
+            JOIN {film_work} AS film_work ON film_work.id = staging.film_work_id
+            JOIN {genre} AS genre ON genre.id = staging.genre_id
+            ON CONFLICT DO NOTHING
+        """,
+    ),
+    Source(
+        name='person_film_work',
+        columns={
+            'id': 'uuid',
+            'film_work_id': 'uuid',
+            'person_id': 'uuid',
+            'role': 'text',
+        },
+        required=('film_work_id', 'person_id'),
+        upsert_sql="""
+            INSERT INTO {person_film_work} (id, film_work_id, person_id, role, created, modified)
+            SELECT coalesce(staging.id, gen_random_uuid()), staging.film_work_id, person.id,
+                staging.role, now(), now()
+            FROM {staging} AS staging
+            JOIN {film_work} AS film_work ON film_work.id = staging.film_work_id
+            LEFT JOIN staging_persons AS staged_person ON staged_person.id = staging.person_id
+            JOIN LATERAL (
+                (
+                    SELECT id FROM {person}
+                    WHERE {normalized_name} = lower(btrim(staged_person.full_name))
+                )
+                UNION ALL
+                (SELECT id FROM {person} WHERE id = staging.person_id)
+                LIMIT 1
+            ) AS person ON true
+            ON CONFLICT DO NOTHING
+        """,
+    ),
+)
+
+
+@dataclass
+class LoadStats:
+    name: str
+    staged: int
+    staged_seconds: float
+    upserted: int = 0
+    upserted_seconds: float = 0
+
+
+class IterableFile:
+    """
+    Файлоподобная обертка над итератором строк для COPY FROM STDIN.
+    """
+
+    def __init__(self, lines: Iterator[str]):
+        self.lines = lines
+        self.buffer = ''
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self.buffer) < size:
+            try:
+                self.buffer += next(self.lines)
+            except StopIteration:
+                break
+        if size < 0:
+            size = len(self.buffer)
+        chunk, self.buffer = self.buffer[:size], self.buffer[size:]
+        return chunk
+
+
+def iter_jsonl_as_csv(path: Path, columns: list[str]) -> Iterator[str]:
+    """
+    Переводит JSONL в CSV с заголовком, отсутствующие ключи становятся NULL.
+    """
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(columns)
+    with path.open(encoding='utf-8') as lines:
+        for line in lines:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            writer.writerow([record.get(column) for column in columns])
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
+    yield output.getvalue()
+
+
+def open_source(
+    path: Path, source: Source
+) -> tuple[list[str], IterableFile | io.TextIOBase]:
+    """
+    Возвращает колонки файла и поток в формате CSV с заголовком.
+    """
+    if path.suffix == '.jsonl':
+        columns = list(source.columns)
+        return columns, IterableFile(iter_jsonl_as_csv(path, columns))
+
+    stream = path.open(encoding='utf-8', newline='')
+    columns = next(csv.reader(stream))
+    stream.seek(0)
+    return columns, stream
+
+
+def validate_columns(source: Source, columns: list[str]):
+    if unknown := set(columns) - set(source.columns):
+        raise ValueError(f'{source.name}: unknown columns {sorted(unknown)}')
+    if missing := set(source.required) - set(columns):
+        raise ValueError(f'{source.name}: missing columns {sorted(missing)}')
+
+
+def get_table_names() -> dict[str, str]:
+    quote_name = connection.ops.quote_name
+    tables = {
+        'film_work': models.Filmwork,
+        'genre': models.Genre,
+        'person': models.Person,
+        'genre_film_work': models.GenreFilmwork,
+        'person_film_work': models.PersonFilmwork,
+    }
+    table_names = {
+        name: quote_name(model._meta.db_table) for name, model in tables.items()
+    }
+    table_names['normalized_name'] = models.NORMALIZED_NAME_SQL
+    return table_names
+
+
+def stage(cursor, source: Source, path: Path | None) -> LoadStats:
+    """
+    Создает временную таблицу и заливает в нее файл через COPY.
+    Без файла таблица остается пустой, чтобы на нее можно было ссылаться из запросов переноса.
+    """
+    staging = f'staging_{source.name}'
+    definition = ', '.join(
+        f'{column} {kind}' for column, kind in source.columns.items()
+    )
+    cursor.execute(f'CREATE TEMP TABLE {staging} ({definition}) ON COMMIT DROP')
+    if path is None:
+        return LoadStats(source.name, 0, 0)
+
+    columns, stream = open_source(path, source)
+    validate_columns(source, columns)
+    started = time.perf_counter()
+    try:
+        cursor.copy_expert(
+            f'COPY {staging} ({", ".join(columns)}) FROM STDIN WITH (FORMAT csv, HEADER true)',
+            stream,
+        )
+    finally:
+        if hasattr(stream, 'close'):
+            stream.close()
+    staged = cursor.rowcount
+    cursor.execute(f'ANALYZE {staging}')
+    return LoadStats(source.name, staged, time.perf_counter() - started)
+
+
+def load(paths: dict[str, Path]) -> list[LoadStats]:
+    """
+    Загружает файлы в схему content. Должна вызываться внутри транзакции:
+    промежуточные таблицы удаляются при ее фиксации.
+    paths сопоставляет имя вида данных из SOURCES с путем к CSV или JSONL файлу.
+    """
+    table_names = get_table_names()
+    stats = []
+    with connection.cursor() as cursor:
+        for source in SOURCES:
+            stats.append(stage(cursor, source, paths.get(source.name)))
+
+        for source, source_stats in zip(SOURCES, stats):
+            started = time.perf_counter()
+            table_names['staging'] = f'staging_{source.name}'
+            cursor.execute(source.upsert_sql.format(**table_names))
+            source_stats.upserted = cursor.rowcount
+            source_stats.upserted_seconds = time.perf_counter() - started
+    return [source_stats for source_stats in stats if source_stats.name in paths]
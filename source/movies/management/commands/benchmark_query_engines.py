@@ -0,0 +1,99 @@
+import random
+
+from django.core.management.base import BaseCommand, CommandError
+from movies.api.v1.views import MoviesApiMixin
+from movies.benchmarks import measure
+from movies.models import Filmwork
+
+ENGINES = {
+    'subquery': MoviesApiMixin.annotate_with_subqueries,
+    'join': MoviesApiMixin.annotate_with_joins,
+}
+
+
+class Command(BaseCommand):
+    help = 'Compares latency of the subquery and join query engines of the movies API.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--page-size', type=int, default=50)
+        parser.add_argument('--min-films', type=int, default=100_000)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        films_count = Filmwork.objects.count()
+        if films_count < options['min_films']:
+            raise CommandError(
+                f'Catalogue has {films_count} films, at least {options["min_films"]} required.'
+            )
+
+        pages_count = films_count // options['page_size']
+        mixin = MoviesApiMixin(kwargs={})
+        film_ids = list(
+            Filmwork.objects.order_by('?').values_list('id', flat=True)[
+                : options['iterations']
+            ]
+        )
+
+        for name, annotate in ENGINES.items():
+            scenarios = self._get_scenarios(
+                mixin, annotate, film_ids, pages_count, options
+            )
+            for scenario, func in scenarios.items():
+                stats = measure(func, options['iterations'])
+                self.stdout.write(
+                    f'{name:<9} {scenario:<7} '
+                    + ' '.join(
+                        f'{key}={value:.2f}'
+                        for key, value in stats.items()
+                        if key != 'runs'
+                    )
+                )
+
+        self._check_same_results(mixin, film_ids)
+
+    def _get_scenarios(self, mixin, annotate, film_ids, pages_count, options) -> dict:
+        """
+        Возвращает сценарии замера: случайная страница списка и карточка фильма.
+        """
+        randomizer = random.Random(options['seed'])
+        page_size = options['page_size']
+        page_query_set = annotate(mixin, Filmwork.objects.order_by('id'))
+        ids_iterator = iter(film_ids * 2)
+
+        def fetch_page():
+            offset = randomizer.randrange(pages_count) * page_size
+            limit = offset + page_size
+            return list(page_query_set[offset:limit])
+
+        def fetch_detail():
+            return list(annotate(mixin, Filmwork.objects.filter(id=next(ids_iterator))))
+
+        return {'page': fetch_page, 'detail': fetch_detail}
+
+    def _check_same_results(self, mixin, film_ids):
+        """
+        Проверяет, что оба способа построения запроса возвращают одинаковые данные.
+        Порядок элементов в массивах не гарантирован, поэтому они сравниваются отсортированными.
+        """
+        results = []
+        for annotate in ENGINES.values():
+            rows = annotate(
+                mixin, Filmwork.objects.filter(id__in=film_ids).order_by('id')
+            )
+            results.append(
+                [
+                    {
+                        key: sorted(value, key=str)
+                        if isinstance(value, list)
+                        else value
+                        for key, value in row.items()
+                    }
+                    for row in rows
+                ]
+            )
+        if results[0] != results[1]:
+            raise CommandError('Query engines returned different results.')
+        self.stdout.write(
+            self.style.SUCCESS(f'Results match for {len(film_ids)} films.')
+        )
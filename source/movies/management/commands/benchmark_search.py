@@ -0,0 +1,113 @@
+import random
+
+from django.core.management.base import BaseCommand, CommandError
+from django.http import QueryDict
+from movies.api.v1.filters import MoviesFilterForm
+from movies.api.v1.views import MoviesListApi
+from movies.benchmarks import measure
+from movies.models import Filmwork, Genre, Person
+
+
+class Command(BaseCommand):
+    help = 'Measures latency of search and filters of the movies list API.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=100)
+        parser.add_argument('--min-films', type=int, default=1_000_000)
+        parser.add_argument('--max-p95', type=float, default=50)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        films_count = Filmwork.objects.count()
+        if films_count < options['min_films']:
+            raise CommandError(
+                f'Catalogue has {films_count} films, at least {options["min_films"]} required.'
+            )
+
+        randomizer = random.Random(options['seed'])
+        samples = get_samples(options['iterations'])
+        failed = []
+        for scenario, make_params in get_scenarios(samples).items():
+            stats = measure_scenario(make_params, randomizer, options['iterations'])
+            self.stdout.write(
+                f'{scenario:<8} '
+                + ' '.join(
+                    f'{key}={value:.2f}'
+                    for key, value in stats.items()
+                    if key != 'runs'
+                )
+            )
+            if stats['p95_ms'] > options['max_p95']:
+                failed.append(scenario)
+
+        if failed:
+            raise CommandError(
+                f'p95 exceeds {options["max_p95"]} ms for: {", ".join(failed)}.'
+            )
+        self.stdout.write(
+            self.style.SUCCESS('All scenarios are within the p95 budget.')
+        )
+
+
+def get_samples(size: int) -> dict:
+    """
+    Возвращает случайные слова из названий, жанры и фрагменты имен участников для запросов.
+    """
+    titles = Filmwork.objects.order_by('?').values_list('title', flat=True)[:size]
+    names = Person.objects.order_by('?').values_list('full_name', flat=True)[:size]
+    return {
+        'words': [word for title in titles for word in title.split() if len(word) > 3],
+        'genres': list(Genre.objects.values_list('name', flat=True)),
+        'names': [name.split()[-1] for name in names if len(name.split()[-1]) >= 3],
+    }
+
+
+def get_scenarios(samples: dict) -> dict:
+    """
+    Возвращает сценарии замера: функции, строящие параметры запроса к списку фильмов.
+    """
+    for key, values in samples.items():
+        if not values:
+            raise CommandError(f'Not enough data to build {key} samples.')
+
+    def make_range(randomizer):
+        low = randomizer.uniform(0, 90)
+        return {'rating_min': low, 'rating_max': low + 10, 'type': 'movie'}
+
+    def make_combined(randomizer):
+        return {
+            'query': randomizer.choice(samples['words']),
+            'genre': randomizer.choice(samples['genres']),
+            'date_from': f'{randomizer.randrange(1950, 2020)}-01-01',
+        }
+
+    return {
+        'query': lambda randomizer: {'query': randomizer.choice(samples['words'])},
+        'genre': lambda randomizer: {'genre': randomizer.choice(samples['genres'])},
+        'person': lambda randomizer: {'person': randomizer.choice(samples['names'])},
+        'range': make_range,
+        'combined': make_combined,
+    }
+
+
+def measure_scenario(make_params, randomizer, iterations: int) -> dict:
+    """
+    Замеряет запросы первой страницы со случайными параметрами сценария.
+    Параметры строятся заранее, чтобы их генерация не попадала в замер.
+    """
+    params = iter([make_params(randomizer) for _ in range(iterations + 1)])
+    return measure(lambda: fetch_page(next(params)), iterations)
+
+
+def fetch_page(params: dict) -> list:
+    """
+    Строит запрос первой страницы списка так же, как MoviesListApi, и выполняет его.
+    """
+    query = QueryDict(mutable=True)
+    query.update(params)
+    view = MoviesListApi(kwargs={})
+    view.filter_form = MoviesFilterForm(query)
+    if not view.filter_form.is_valid():
+        raise CommandError(f'Invalid benchmark parameters: {view.filter_form.errors}')
+    end = view.paginate_by
+    return list(view.get_queryset()[:end])
@@ -0,0 +1,100 @@
+import datetime
+import uuid
+from typing import Callable
+
+from django.core.management.base import BaseCommand
+from django.http import QueryDict
+from movies.api.v1 import serialization
+from movies.api.v1.filters import MoviesFilterForm
+from movies.api.v1.views import MoviesListApi
+from movies.benchmarks import measure
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures serialization cost of a movies list API page for each JSON encoder.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument(
+            '--synthetic',
+            action='store_true',
+            help='Serialize generated rows instead of reading a page from the database.',
+        )
+
+    def handle(self, *args, **options):
+        queryset = get_page_queryset()
+        if options['synthetic']:
+            rows = make_synthetic_page(MoviesListApi.paginate_by)
+        else:
+            rows = list(queryset)
+
+        for name, encode in serialization.get_available_encoders().items():
+            stats = measure_encoder(encode, lambda: rows, options['iterations'])
+            self.write_stats(f'encode:{name}', stats)
+
+        if not options['synthetic']:
+            self.measure_fetch(queryset, options['iterations'])
+
+    def measure_fetch(self, queryset, iterations: int):
+        """
+        Сравнивает чтение страницы с кодированием в Python и сборку JSON в PostgreSQL.
+        """
+        for name, encode in serialization.get_available_encoders().items():
+            stats = measure_encoder(encode, queryset.all, iterations)
+            self.write_stats(f'fetch+encode:{name}', stats)
+        stats = measure(lambda: serialization.fetch_json_array(queryset), iterations)
+        self.write_stats('fetch:db_json', stats)
+
+    def write_stats(self, path: str, stats: dict):
+        self.stdout.write(
+            f'{path:<22} '
+            + ' '.join(
+                f'{key}={value:.3f}' for key, value in stats.items() if key != 'runs'
+            )
+        )
+
+
+def measure_encoder(
+    encode: serialization.Encoder, get_rows: Callable, iterations: int
+) -> dict:
+    """
+    Замеряет получение записей страницы функцией get_rows и их кодирование.
+    """
+    return measure(lambda: encode({'results': list(get_rows())}), iterations)
+
+
+def get_page_queryset():
+    """
+    Возвращает запрос первой страницы списка фильмов так же, как его строит MoviesListApi.
+    """
+    view = MoviesListApi(kwargs={})
+    view.filter_form = MoviesFilterForm(QueryDict())
+    view.filter_form.is_valid()
+    end = view.paginate_by
+    return view.get_queryset()[:end]
+
+
+def make_synthetic_page(size: int) -> list[dict]:
+    """
+    Возвращает страницу записей с теми же колонками и типами, что и ответ API.
+    """
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    return [
+        {
+            'created': now,
+            'modified': now,
+            'id': uuid.uuid4(),
+            'title': f'Film {number}',
+            'description': 'Lorem ipsum dolor sit amet. ' * 10,
+            'creation_date': now.date(),
+            'rating': number % 100 / 10,
+            'type': 'movie',
+            'genres': ['Action', 'Drama'],
+            'actors': [f'Actor {number} {index}' for index in range(8)],
+            'directors': [f'Director {number}'],
+            'writers': [f'Writer {number} {index}' for index in range(2)],
+        }
+        for number in range(size)
+    ]
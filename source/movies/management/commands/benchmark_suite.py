@@ -0,0 +1,184 @@
+import datetime
+import json
+import random
+import subprocess
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from movies.benchmarks import measure_requests
+from movies.models import Filmwork
+
+# Допустимое ухудшение p95 относительно базового прогона при сравнении (--compare), в процентах.
+DEFAULT_TOLERANCE = 20
+
+
+class Command(BaseCommand):
+    help = (
+        'Runs the repeatable benchmark suite against the local PostgreSQL: list pages, '
+        'deep pages, film details and the admin changelist. Reports p50/p95/p99 latency '
+        'and throughput and stores the results as JSON to compare between commits.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument(
+            '--output', type=Path, help='JSON file to store the results in.'
+        )
+        parser.add_argument(
+            '--compare',
+            type=Path,
+            help='JSON file of a previous run. Fails if p95 of a scenario regressed.',
+        )
+        parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+        parser.add_argument(
+            '--admin-user',
+            help='Superuser for the admin scenarios. The first active one by default.',
+        )
+        parser.add_argument(
+            '--host',
+            default=get_default_host(),
+            help='Host header of the requests. Derived from ALLOWED_HOSTS by default.',
+        )
+
+    def handle(self, *args, **options):
+        films_count = Filmwork.objects.count()
+        if not films_count:
+            raise CommandError('Catalogue is empty, run generate_catalogue first.')
+
+        randomizer = random.Random(options['seed'])
+        results = {}
+        for scenario, urls in self.get_scenarios(films_count, randomizer, options):
+            client = self.get_client(scenario, options)
+            results[scenario] = measure_requests(client, urls)
+            self.stdout.write(
+                f'{scenario:<16} '
+                + ' '.join(
+                    f'{key}={value:.2f}'
+                    if isinstance(value, float)
+                    else f'{key}={value}'
+                    for key, value in results[scenario].items()
+                )
+            )
+
+        report = make_report(films_count, results)
+        if options['output']:
+            options['output'].parent.mkdir(parents=True, exist_ok=True)
+            options['output'].write_text(json.dumps(report, indent=2), encoding='utf-8')
+            self.stdout.write(f'Results are stored in {options["output"]}.')
+        if options['compare']:
+            self.compare(report, options['compare'], options['tolerance'])
+
+    def get_scenarios(self, films_count: int, randomizer: random.Random, options):
+        """
+        Возвращает сценарии и адреса их запросов. Глубокие страницы выбираются
+        из последних 10% каталога, карточки фильмов - случайно по всему каталогу.
+        """
+        iterations = options['iterations']
+        film_ids = list(
+            Filmwork.objects.order_by('?').values_list('id', flat=True)[:iterations]
+        )
+        film_ids = [randomizer.choice(film_ids) for _ in range(iterations)]
+
+        yield 'list', ['/api/v1/movies/'] * iterations
+        yield 'list_deep', get_deep_pages(
+            '/api/v1/movies/?page=', films_count, 50, randomizer, iterations
+        )
+        yield 'list_cursor', ['/api/v1/movies/?pagination=cursor'] * iterations
+        yield 'detail', [f'/api/v1/movies/{film_id}/' for film_id in film_ids]
+        if self.get_admin_user(options) is None:
+            self.stderr.write('No active superuser found, admin scenarios are skipped.')
+            return
+        yield 'admin_list', ['/admin/movies/filmwork/'] * iterations
+        yield 'admin_list_deep', get_deep_pages(
+            '/admin/movies/filmwork/?p=', films_count, 100, randomizer, iterations
+        )
+
+    def get_client(self, scenario: str, options) -> Client:
+        client = Client(HTTP_HOST=options['host'])
+        if scenario.startswith('admin'):
+            client.force_login(self.get_admin_user(options))
+        return client
+
+    def get_admin_user(self, options):
+        users = get_user_model().objects.filter(is_superuser=True, is_active=True)
+        if options['admin_user']:
+            users = users.filter(username=options['admin_user'])
+        return users.order_by('pk').first()
+
+    def compare(self, report: dict, path: Path, tolerance: float):
+        """
+        Сравнивает p95 сценариев с прошлым прогоном и завершается ошибкой при ухудшении.
+        """
+        baseline = json.loads(path.read_text(encoding='utf-8'))
+        regressed = []
+        for scenario, stats in report['scenarios'].items():
+            if (previous := baseline['scenarios'].get(scenario)) is None:
+                continue
+            change = (stats['p95_ms'] / previous['p95_ms'] - 1) * 100
+            self.stdout.write(
+                f'{scenario:<16} p95 {previous["p95_ms"]:.2f} -> {stats["p95_ms"]:.2f} ms '
+                f'({change:+.1f}%)'
+            )
+            if change > tolerance:
+                regressed.append(scenario)
+        if regressed:
+            raise CommandError(
+                f'p95 regressed by more than {tolerance}% for: {", ".join(regressed)}.'
+            )
+
+
+def get_deep_pages(
+    prefix: str, films_count: int, per_page: int, randomizer, iterations: int
+) -> list[str]:
+    pages_count = max(1, -(-films_count // per_page))
+    deep_from = max(1, pages_count * 9 // 10)
+    return [
+        f'{prefix}{randomizer.randint(deep_from, pages_count)}'
+        for _ in range(iterations)
+    ]
+
+
+def get_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def make_report(films_count: int, results: dict) -> dict:
+    """
+    Возвращает отчет прогона с условиями, от которых зависят результаты.
+    """
+    return {
+        'commit': get_commit(),
+        'created': datetime.datetime.now(tz=datetime.timezone.utc).isoformat(),
+        'films': films_count,
+        'settings': {
+            'query_engine': settings.MOVIES_API_QUERY_ENGINE,
+            'db_json': settings.MOVIES_API_DB_JSON,
+            'json_encoder': settings.MOVIES_API_JSON_ENCODER,
+            'connection_mode': settings.DB_CONNECTION_MODE,
+            'replicas': settings.DATABASE_REPLICAS,
+        },
+        'scenarios': results,
+    }
+
+
+def get_default_host() -> str:
+    """
+    Возвращает хост, разрешенный ALLOWED_HOSTS: для шаблона '*' подходит любой,
+    а шаблон '.example.com' разрешает и сам домен example.com.
+    """
+    if not settings.ALLOWED_HOSTS or settings.ALLOWED_HOSTS[0] == '*':
+        return 'localhost'
+    return settings.ALLOWED_HOSTS[0].lstrip('.')
@@ -0,0 +1,22 @@
+import sys
+
+from django.core.management.base import BaseCommand
+from movies.api.v1.export import iter_ndjson
+from movies.api.v1.views import MoviesApiMixin
+
+
+class Command(BaseCommand):
+    help = 'Exports the whole catalogue as NDJSON in the /api/v1/movies/ record format.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='File to write to, stdout by default.')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        query_set = MoviesApiMixin(kwargs={}).get_queryset()
+        lines = iter_ndjson(query_set, options['chunk_size'])
+        if options['output']:
+            with open(options['output'], 'wb') as output:
+                output.writelines(lines)
+        else:
+            sys.stdout.buffer.writelines(lines)
@@ -0,0 +1,47 @@
+import tempfile
+import time
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from movies.generator import CatalogueGenerator, CatalogueShape
+
+
+class Command(BaseCommand):
+    help = (
+        'Generates a synthetic catalogue with skewed distributions (power-law cast sizes, '
+        'popular persons and genres) and loads it with load_content.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--films', type=int, default=100_000)
+        parser.add_argument('--persons', type=int, default=50_000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument(
+            '--output',
+            type=Path,
+            help='Directory to keep the generated CSV files in. A temporary one by default.',
+        )
+        parser.add_argument(
+            '--no-load',
+            action='store_true',
+            help='Only write the CSV files into --output, do not load them into the database.',
+        )
+
+    def handle(self, *args, **options):
+        if options['no_load'] and options['output'] is None:
+            # Временный каталог удаляется сразу после генерации, и файлы бы пропали.
+            raise CommandError('--no-load requires --output.')
+
+        shape = CatalogueShape(films=options['films'], persons=options['persons'])
+        generator = CatalogueGenerator(shape, options['seed'])
+        with tempfile.TemporaryDirectory() as temporary:
+            directory = options['output'] or Path(temporary)
+            started = time.perf_counter()
+            generator.write(directory)
+            self.stdout.write(
+                f'Generated {shape.films} films and {shape.persons} persons '
+                f'in {time.perf_counter() - started:.1f} s: {directory}'
+            )
+            if not options['no_load']:
+                call_command('load_content', dir=directory, stdout=self.stdout)
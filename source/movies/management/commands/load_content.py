@@ -0,0 +1,101 @@
+from pathlib import Path
+
+from config.routers import PROCESS_LOCAL_CACHES
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DataError, IntegrityError, transaction
+from movies.api.v1.cache import DETAIL_CACHE_ALIAS
+from movies.api.v1.counts import invalidate_counts
+from movies.loader import SOURCES, load
+
+
+class Command(BaseCommand):
+    help = (
+        'Bulk loads films, genres, persons and their links from CSV/JSONL files '
+        'through COPY into staging tables and set-based upserts.'
+    )
+
+    def add_arguments(self, parser):
+        for source in SOURCES:
+            parser.add_argument(
+                f'--{source.name.replace("_", "-")}',
+                dest=source.name,
+                type=Path,
+                help=f'CSV or JSONL file with columns: {", ".join(source.columns)}.',
+            )
+        parser.add_argument(
+            '--dir',
+            type=Path,
+            help='Directory with files named after the sources, e.g. films.csv or persons.jsonl.',
+        )
+
+    def handle(self, *args, **options):
+        paths = get_paths(options)
+        if not paths:
+            raise CommandError('Nothing to load.')
+
+        try:
+            with transaction.atomic():
+                stats = load(paths)
+        except (ValueError, IntegrityError, DataError) as error:
+            raise CommandError(str(error)) from error
+
+        # Массовая загрузка не вызывает сигналы моделей, поэтому кэши сбрасываются целиком.
+        # Серверы видят сброс, только если кэши общие для всех процессов.
+        invalidate_counts()
+        caches[DETAIL_CACHE_ALIAS].clear()
+        if local_aliases := get_process_local_caches():
+            self.stderr.write(
+                self.style.WARNING(
+                    f'Caches {", ".join(local_aliases)} are process-local: running '
+                    f'servers keep cached counts and film details until they expire. '
+                    f'Configure shared caches (CACHE_BACKEND, MOVIES_DETAIL_CACHE_BACKEND) '
+                    f'or restart the servers.'
+                )
+            )
+
+        for source_stats in stats:
+            self.stdout.write(
+                f'{source_stats.name:<17} '
+                f'staged {source_stats.staged} rows '
+                f'({rate(source_stats.staged, source_stats.staged_seconds)} rows/s), '
+                f'upserted {source_stats.upserted} rows '
+                f'({rate(source_stats.upserted, source_stats.upserted_seconds)} rows/s)'
+            )
+
+
+def find_in_dir(directory: Path | None, name: str) -> Path | None:
+    if directory is None:
+        return None
+    for suffix in ('.csv', '.jsonl'):
+        if (path := directory / f'{name}{suffix}').exists():
+            return path
+    return None
+
+
+def rate(rows: int, seconds: float) -> int:
+    return round(rows / seconds) if seconds else rows
+
+
+def get_process_local_caches() -> list[str]:
+    return [
+        alias
+        for alias in (DEFAULT_CACHE_ALIAS, DETAIL_CACHE_ALIAS)
+        if settings.CACHES[alias]['BACKEND'] in PROCESS_LOCAL_CACHES
+    ]
+
+
+def get_paths(options) -> dict[str, Path]:
+    """
+    Возвращает файлы по видам данных: явно переданные или найденные в каталоге --dir.
+    """
+    paths = {}
+    for source in SOURCES:
+        path = options[source.name] or find_in_dir(options['dir'], source.name)
+        if path is None:
+            continue
+        if not path.is_file():
+            raise CommandError(f'File not found: {path}')
+        paths[source.name] = path
+    return paths
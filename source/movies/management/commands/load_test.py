@@ -0,0 +1,99 @@
+import json
+import random
+import urllib.parse
+
+from django.core.management.base import BaseCommand, CommandError
+from movies.benchmarks import RssSampler, read_rss, run_load
+from movies.models import Filmwork
+
+
+class Command(BaseCommand):
+    help = (
+        'Load-tests a running API server at several concurrency levels and reports latency, '
+        'throughput and server memory per in-flight request. Run it once against uWSGI '
+        '(uwsgi.ini) and once against gunicorn with uvicorn workers (gunicorn.conf.py, '
+        'MOVIES_API_ASYNC=True) to compare the deployment modes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument(
+            '--label', default='server', help='Name of the deployment mode.'
+        )
+        parser.add_argument(
+            '--concurrency', type=int, nargs='+', default=[8, 32, 128, 256]
+        )
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument(
+            '--server-pid',
+            type=int,
+            nargs='*',
+            default=[],
+            help='PIDs of the server master and workers to sample memory from.',
+        )
+        parser.add_argument('--timeout', type=float, default=30)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument(
+            '--json', action='store_true', help='Print results as JSON lines.'
+        )
+
+    def handle(self, *args, **options):
+        urls = self.get_urls(options)
+        for concurrency in options['concurrency']:
+            result = self.run_level(urls, concurrency, options)
+            if options['json']:
+                self.stdout.write(json.dumps(result))
+            else:
+                self.stdout.write(
+                    ' '.join(
+                        f'{key}={value:.2f}'
+                        if isinstance(value, float)
+                        else f'{key}={value}'
+                        for key, value in result.items()
+                    )
+                )
+
+    def get_urls(self, options) -> list[str]:
+        """
+        Возвращает смесь запросов: страницы списка, карточки фильмов и поиск.
+        Карточки выбираются случайно, поэтому часть из них не попадает в кэш.
+        """
+        film_ids = list(
+            Filmwork.objects.order_by('?').values_list('id', flat=True)[
+                : options['requests']
+            ]
+        )
+        if not film_ids:
+            raise CommandError('Catalogue is empty.')
+
+        randomizer = random.Random(options['seed'])
+        base_url = options['base_url'].rstrip('/')
+        paths = [
+            lambda: f'/api/v1/movies/?page={randomizer.randint(1, 20)}',
+            lambda: f'/api/v1/movies/{randomizer.choice(film_ids)}/',
+            lambda: '/api/v1/movies/?'
+            + urllib.parse.urlencode({'sort': '-rating', 'type': 'movie'}),
+        ]
+        return [
+            base_url + randomizer.choice(paths)() for _ in range(options['requests'])
+        ]
+
+    def run_level(self, urls: list[str], concurrency: int, options) -> dict:
+        """
+        Выполняет нагрузку с заданной конкурентностью, замеряя пик памяти процессов сервера.
+        Прирост памяти относительно простоя, деленный на число запросов в полете,
+        оценивает стоимость одного одновременного запроса для режима развертывания.
+        """
+        pids = options['server_pid']
+        idle_rss = read_rss(pids)
+        sampler = RssSampler(pids)
+        sampler.start()
+        summary = run_load(urls, concurrency, options['timeout'])
+        peak_rss = sampler.stop()
+
+        result = {'label': options['label'], 'concurrency': concurrency, **summary}
+        if pids:
+            result['idle_rss_mb'] = idle_rss / 2**20
+            result['peak_rss_mb'] = peak_rss / 2**20
+            result['kb_per_inflight'] = (peak_rss - idle_rss) / 1024 / concurrency
+        return result
@@ -0,0 +1,45 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+from movies.read_model import get_watermark, refresh_all, refresh_changed
+
+
+class Command(BaseCommand):
+    help = (
+        'Refreshes the denormalized film_work_read_model table. '
+        'Without --full only films changed since the previous refresh are rebuilt.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Rebuild every film.')
+        parser.add_argument(
+            '--since',
+            help='ISO datetime to look for changes from instead of the stored watermark.',
+        )
+        parser.add_argument(
+            '--overlap',
+            type=int,
+            default=60,
+            help='Seconds subtracted from the watermark to catch transactions committed late.',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        since = self.get_since(options)
+        if options['full'] or since is None:
+            refreshed, deleted = refresh_all()
+        else:
+            refreshed, deleted = refresh_changed(since, options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Refreshed {refreshed} films, deleted {deleted}.')
+        )
+
+    def get_since(self, options) -> datetime.datetime | None:
+        if options['since']:
+            if (since := parse_datetime(options['since'])) is None:
+                raise CommandError(f'Invalid datetime: {options["since"]}')
+            return since
+        if (watermark := get_watermark()) is None:
+            return None
+        return watermark - datetime.timedelta(seconds=options['overlap'])
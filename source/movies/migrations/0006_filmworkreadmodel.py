@@ -0,0 +1,67 @@
+# Generated by Django 4.2.5 on 2026-10-18 20:08
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('movies', '0005_alter_personfilmwork_role'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FilmworkReadModel',
+            fields=[
+                ('created', models.DateTimeField()),
+                ('modified', models.DateTimeField()),
+                ('id', models.UUIDField(primary_key=True, serialize=False)),
+                ('title', models.TextField()),
+                ('description', models.TextField()),
+                ('creation_date', models.DateField()),
+                ('rating', models.FloatField()),
+                (
+                    'type',
+                    models.CharField(
+                        choices=[('movie', 'movie'), ('tv_show', 'tv_show')]
+                    ),
+                ),
+                (
+                    'genres',
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.TextField(null=True), size=None
+                    ),
+                ),
+                (
+                    'actors',
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.TextField(), size=None
+                    ),
+                ),
+                (
+                    'directors',
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.TextField(), size=None
+                    ),
+                ),
+                (
+                    'writers',
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.TextField(), size=None
+                    ),
+                ),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'content"."film_work_read_model',
+                'indexes': [
+                    models.Index(
+                        fields=['creation_date'], name='film_work_read_model_date_idx'
+                    ),
+                    models.Index(
+                        fields=['refreshed_at'], name='film_work_read_model_ref_idx'
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.5 on 2026-10-18 20:11
+
+from django.db import migrations, models
+
+# Индексы на modified у фильмов и связей создает следующая миграция в виде, пригодном
+# и для максимумов modified, и для ленты изменений, поэтому здесь они не строятся.
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('movies', '0006_filmworkreadmodel'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='genre',
+            index=models.Index(fields=['modified'], name='genre_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='person',
+            index=models.Index(fields=['modified'], name='person_modified_idx'),
+        ),
+    ]
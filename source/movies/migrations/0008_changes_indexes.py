@@ -0,0 +1,32 @@
+# Generated by Django 4.2.5 on 2026-10-18 20:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('movies', '0007_modified_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='filmwork',
+            index=models.Index(fields=['modified', 'id'], name='film_work_changes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='genrefilmwork',
+            index=models.Index(
+                fields=['modified'],
+                include=('film_work',),
+                name='genre_film_work_changes_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='personfilmwork',
+            index=models.Index(
+                fields=['modified'],
+                include=('film_work',),
+                name='person_film_work_changes_idx',
+            ),
+        ),
+    ]
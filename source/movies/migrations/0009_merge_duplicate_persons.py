@@ -0,0 +1,54 @@
+from django.db import migrations
+
+# Перед созданием уникального индекса по нормализованному имени дубли участников сливаются
+# в самую раннюю запись: связи дублей переносятся на нее, а совпадающие связи удаляются.
+MERGE_DUPLICATE_PERSONS_SQL = """
+CREATE TEMP TABLE person_merge ON COMMIT DROP AS
+SELECT id, keep_id
+FROM (
+    SELECT
+        id,
+        first_value(id) OVER (PARTITION BY lower(btrim(full_name)) ORDER BY created, id) AS keep_id
+    FROM content.person
+) AS ranked
+WHERE id <> keep_id;
+
+CREATE INDEX ON person_merge (id);
+ANALYZE person_merge;
+
+DELETE FROM content.person_film_work
+WHERE id IN (
+    SELECT id
+    FROM (
+        SELECT
+            link.id,
+            row_number() OVER (
+                PARTITION BY link.film_work_id, coalesce(merge.keep_id, link.person_id), link.role
+                ORDER BY merge.keep_id IS NOT NULL, link.created, link.id
+            ) AS position
+        FROM content.person_film_work AS link
+        LEFT JOIN person_merge AS merge ON merge.id = link.person_id
+        WHERE coalesce(merge.keep_id, link.person_id) IN (SELECT keep_id FROM person_merge)
+    ) AS ranked
+    WHERE position > 1
+);
+
+UPDATE content.person_film_work AS link
+SET person_id = merge.keep_id, modified = now()
+FROM person_merge AS merge
+WHERE link.person_id = merge.id;
+
+DELETE FROM content.person AS person
+USING person_merge AS merge
+WHERE person.id = merge.id;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('movies', '0008_changes_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(MERGE_DUPLICATE_PERSONS_SQL, migrations.RunSQL.noop),
+    ]
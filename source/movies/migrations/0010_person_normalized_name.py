@@ -0,0 +1,23 @@
+# Generated by Django 4.2.5 on 2026-10-18 20:16
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('movies', '0009_merge_duplicate_persons'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='person',
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.text.Lower(
+                    django.db.models.functions.text.Trim('full_name')
+                ),
+                name='person_normalized_name_idx',
+                violation_error_message='Film crew member with this name already exists.',
+            ),
+        ),
+    ]
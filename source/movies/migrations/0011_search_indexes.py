@@ -0,0 +1,45 @@
+# Generated by Django 4.2.5 on 2026-10-18 20:20
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('movies', '0010_person_normalized_name'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='filmwork',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.search.SearchVector(
+                    'title', 'description', config='simple'
+                ),
+                name='film_work_search_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='filmworkreadmodel',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.search.SearchVector(
+                    'title', 'description', config='simple'
+                ),
+                name='film_work_read_model_fts_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='person',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper('full_name'),
+                    name='gin_trgm_ops',
+                ),
+                name='person_full_name_trgm_idx',
+            ),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.5 on 2026-10-18 20:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('movies', '0011_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='filmwork',
+            name='film_work_creation_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='filmworkreadmodel',
+            name='film_work_read_model_date_idx',
+        ),
+        migrations.AddIndex(
+            model_name='filmwork',
+            index=models.Index(
+                fields=['creation_date', 'id'], name='film_work_creation_date_idx'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='filmwork',
+            index=models.Index(fields=['rating', 'id'], name='film_work_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='filmwork',
+            index=models.Index(fields=['title', 'id'], name='film_work_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='filmworkreadmodel',
+            index=models.Index(
+                fields=['creation_date', 'id'], name='film_work_read_model_date_idx'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='filmworkreadmodel',
+            index=models.Index(
+                fields=['rating', 'id'], name='film_work_read_model_rate_idx'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='filmworkreadmodel',
+            index=models.Index(
+                fields=['title', 'id'], name='film_work_read_model_title_idx'
+            ),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.5 on 2026-10-18 20:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('movies', '0012_sort_indexes'),
+    ]
+
+    operations = [
+        # Составные индексы создаются до удаления индексов внешних ключей,
+        # чтобы поиск по участнику и жанру не оставался без индекса.
+        migrations.AddIndex(
+            model_name='genrefilmwork',
+            index=models.Index(
+                fields=['genre', 'film_work'], name='genre_film_work_genre_idx'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='personfilmwork',
+            index=models.Index(
+                fields=['person', 'role', 'film_work'],
+                name='person_film_work_person_idx',
+            ),
+        ),
+        migrations.AlterField(
+            model_name='genrefilmwork',
+            name='genre',
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to='movies.genre',
+            ),
+        ),
+        migrations.AlterField(
+            model_name='personfilmwork',
+            name='person',
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to='movies.person',
+            ),
+        ),
+    ]
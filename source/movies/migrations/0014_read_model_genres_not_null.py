@@ -0,0 +1,28 @@
+# Generated by Django 4.2.5 on 2026-10-18 20:58
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+# Строки витрины, собранные до исправления, содержат [NULL] у фильмов без жанров.
+REMOVE_NULL_GENRES_SQL = """
+    UPDATE content.film_work_read_model
+    SET genres = array_remove(genres, NULL)
+    WHERE array_position(genres, NULL) IS NOT NULL
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('movies', '0013_person_genre_link_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='filmworkreadmodel',
+            name='genres',
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.TextField(), size=None
+            ),
+        ),
+        migrations.RunSQL(REMOVE_NULL_GENRES_SQL, migrations.RunSQL.noop),
+    ]
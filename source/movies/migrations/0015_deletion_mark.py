@@ -0,0 +1,22 @@
+# Generated by Django 4.2.5 on 2026-10-18 21:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('movies', '0014_read_model_genres_not_null'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletionMark',
+            fields=[
+                ('model', models.TextField(primary_key=True, serialize=False)),
+                ('deleted_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'content"."deletion_mark',
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.5 on 2026-10-18 21:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('movies', '0015_deletion_mark'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FilmworkTombstone',
+            fields=[
+                ('id', models.UUIDField(primary_key=True, serialize=False)),
+                ('deleted_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'content"."film_work_tombstone',
+                'indexes': [
+                    models.Index(
+                        fields=['deleted_at'], name='film_work_tombstone_del_idx'
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.5 on 2026-10-18 21:15
+
+from django.db import migrations, models
+
+# Пустое описание хранится как '', и уникальность описания не давала
+# завести второй жанр без описания ни в админке, ни командой load_content.
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('movies', '0016_film_work_tombstone'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='genre',
+            name='description',
+            field=models.TextField(blank=True, verbose_name='description'),
+        ),
+    ]
@@ -1,9 +1,24 @@
 import uuid
 
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import Lower, Trim, Upper
 from django.utils.translation import gettext_lazy as _
 
+# Нормализованное имя участника: по нему участники считаются дублями.
+# NORMALIZED_NAME_SQL должен совпадать с выражением уникального индекса, чтобы ON CONFLICT
+# в load_content его нашел. Форма админки проверяет уникальность по тому же ограничению.
+NORMALIZED_NAME = Lower(Trim('full_name'))
+NORMALIZED_NAME_SQL = 'lower(btrim(full_name))'
+
+# Полнотекстовый поиск по фильмам. Конфигурация simple не выполняет стемминг:
+# каталог содержит названия на разных языках. Запросы используют то же выражение, что и GIN индексы.
+SEARCH_CONFIG = 'simple'
+SEARCH_VECTOR = SearchVector('title', 'description', config=SEARCH_CONFIG)
+
 
 class TimeStampedMixin(models.Model):
     created = models.DateTimeField(auto_now_add=True)
@@ -23,34 +38,69 @@ class UUIDMixin(models.Model):
 
 class Genre(UUIDMixin, TimeStampedMixin):
     name = models.CharField(_('name'), max_length=255)
-    description = models.TextField(_('description'), blank=True, unique=True)
+    description = models.TextField(_('description'), blank=True)
 
     class Meta:
         db_table = "content\".\"genre"
         verbose_name = _('Genre')
         verbose_name_plural = _('Genres')
 
+        indexes = [models.Index(fields=['modified'], name='genre_modified_idx')]
+
     def __str__(self):
         return self.name
 
 
+class PersonManager(models.Manager):
+    def get_or_create_by_name(self, full_name: str) -> tuple['Person', bool]:
+        """
+        Возвращает участника с тем же нормализованным именем или создает нового.
+        Одновременная вставка того же имени другим процессом отвергается уникальным индексом,
+        и тогда возвращается вставленная им запись.
+        """
+        query_set = self.alias(normalized_name=NORMALIZED_NAME).filter(
+            normalized_name=Lower(Trim(models.Value(full_name)))
+        )
+        if (person := query_set.first()) is not None:
+            return person, False
+        try:
+            with transaction.atomic(using=self.db):
+                return self.create(full_name=full_name), True
+        except IntegrityError:
+            return query_set.get(), False
+
+
 class Person(UUIDMixin, TimeStampedMixin):
     full_name = models.TextField(_('full name'), blank=False)
 
+    objects = PersonManager()
+
     class Meta:
         db_table = "content\".\"person"
         verbose_name = _('film crew member')
         verbose_name_plural = _('film crew')
 
+        indexes = [
+            models.Index(fields=['modified'], name='person_modified_idx'),
+            # Поиск подстроки без учета регистра (icontains) строит UPPER(full_name) LIKE '%...%'.
+            GinIndex(
+                OpClass(Upper('full_name'), name='gin_trgm_ops'),
+                name='person_full_name_trgm_idx',
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                NORMALIZED_NAME,
+                name='person_normalized_name_idx',
+                violation_error_message=_(
+                    'Film crew member with this name already exists.'
+                ),
+            ),
+        ]
+
     def __str__(self):
         return self.full_name
 
-    def save(self, *args, **kwargs):
-        try:
-            Person.objects.get(full_name=self.full_name)
-        except Person.DoesNotExist:
-            super().save(*args, **kwargs)
-
 
 class Filmwork(UUIDMixin, TimeStampedMixin):
     class FilmworkTypes(models.TextChoices):
@@ -81,7 +131,14 @@ class Filmwork(UUIDMixin, TimeStampedMixin):
         verbose_name_plural = _('film works')
 
         indexes = [
-            models.Index(fields=['creation_date'], name='film_work_creation_date_idx')
+            # Индексы сортировок списка фильмов, см. SORT_ORDERINGS в movies.api.v1.filters.
+            models.Index(
+                fields=['creation_date', 'id'], name='film_work_creation_date_idx'
+            ),
+            models.Index(fields=['rating', 'id'], name='film_work_rating_idx'),
+            models.Index(fields=['title', 'id'], name='film_work_title_idx'),
+            models.Index(fields=['modified', 'id'], name='film_work_changes_idx'),
+            GinIndex(SEARCH_VECTOR, name='film_work_search_idx'),
         ]
 
     def __str__(self):
@@ -90,13 +147,26 @@ class Filmwork(UUIDMixin, TimeStampedMixin):
 
 class GenreFilmwork(UUIDMixin, TimeStampedMixin):
     film_work = models.ForeignKey('Filmwork', on_delete=models.CASCADE)
-    genre = models.ForeignKey('Genre', on_delete=models.CASCADE)
+    # Отдельный индекс по genre_id не нужен: его заменяет genre_film_work_genre_idx.
+    genre = models.ForeignKey('Genre', on_delete=models.CASCADE, db_index=False)
 
     class Meta:
         db_table = "content\".\"genre_film_work"
         verbose_name = _('film\'s genre')
         verbose_name_plural = _('film\'s genres')
 
+        indexes = [
+            models.Index(
+                fields=['modified'],
+                include=['film_work'],
+                name='genre_film_work_changes_idx',
+            ),
+            # Фильмы жанра для фильтра genre читаются из индекса без обращения к таблице.
+            models.Index(
+                fields=['genre', 'film_work'], name='genre_film_work_genre_idx'
+            ),
+        ]
+
         constraints = [
             models.UniqueConstraint(
                 fields=['film_work', 'genre'], name='film_work_genre_idx'
@@ -111,7 +181,8 @@ class PersonFilmwork(UUIDMixin, TimeStampedMixin):
         WRITER = 'writer', _('writer')
 
     film_work = models.ForeignKey('Filmwork', on_delete=models.CASCADE)
-    person = models.ForeignKey('Person', on_delete=models.CASCADE)
+    # Отдельный индекс по person_id не нужен: его заменяет person_film_work_person_idx.
+    person = models.ForeignKey('Person', on_delete=models.CASCADE, db_index=False)
     role = models.CharField(_('role'), choices=PersonFilmworkRoles.choices, null=True)
 
     class Meta:
@@ -119,8 +190,96 @@ class PersonFilmwork(UUIDMixin, TimeStampedMixin):
         verbose_name = _('film crew member')
         verbose_name_plural = _('film crew')
 
+        indexes = [
+            models.Index(
+                fields=['modified'],
+                include=['film_work'],
+                name='person_film_work_changes_idx',
+            ),
+            # Фильмография участника по ролям и фильтр person читаются из индекса
+            # без обращения к таблице: уникальный film_work_person_role_idx начинается с фильма.
+            models.Index(
+                fields=['person', 'role', 'film_work'],
+                name='person_film_work_person_idx',
+            ),
+        ]
+
         constraints = [
             models.UniqueConstraint(
                 fields=['film_work', 'person', 'role'], name='film_work_person_role_idx'
             ),
         ]
+
+
+class FilmworkReadModel(models.Model):
+    """
+    Денормализованная копия фильма с готовыми массивами жанров и участников по ролям.
+    Заполняется командой refresh_read_model и используется API только для чтения.
+    """
+
+    created = models.DateTimeField()
+    modified = models.DateTimeField()
+    id = models.UUIDField(primary_key=True)
+    title = models.TextField()
+    description = models.TextField()
+    creation_date = models.DateField()
+    rating = models.FloatField()
+    type = models.CharField(choices=Filmwork.FilmworkTypes.choices)
+    genres = ArrayField(models.TextField())
+    actors = ArrayField(models.TextField())
+    directors = ArrayField(models.TextField())
+    writers = ArrayField(models.TextField())
+    # Время обновления строки, по нему определяется граница следующего инкрементального обновления.
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "content\".\"film_work_read_model"
+
+        indexes = [
+            models.Index(
+                fields=['creation_date', 'id'], name='film_work_read_model_date_idx'
+            ),
+            models.Index(fields=['rating', 'id'], name='film_work_read_model_rate_idx'),
+            models.Index(fields=['title', 'id'], name='film_work_read_model_title_idx'),
+            models.Index(fields=['refreshed_at'], name='film_work_read_model_ref_idx'),
+            GinIndex(SEARCH_VECTOR, name='film_work_read_model_fts_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class DeletionMark(models.Model):
+    """
+    Время последнего удаления строк модели. Удаление не оставляет следа в колонках modified,
+    поэтому время удаления хранится здесь, в одной строке на модель, и видно всем процессам.
+    """
+
+    model = models.TextField(primary_key=True)
+    deleted_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "content\".\"deletion_mark"
+
+    def __str__(self):
+        return self.model
+
+
+class FilmworkTombstone(models.Model):
+    """
+    Отметка об удалении фильма для ленты изменений: удаленный фильм не оставляет
+    записей в таблицах, по которым строится лента, и потребитель не узнал бы об удалении.
+    """
+
+    id = models.UUIDField(primary_key=True)
+    deleted_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "content\".\"film_work_tombstone"
+
+        indexes = [
+            models.Index(fields=['deleted_at'], name='film_work_tombstone_del_idx'),
+        ]
+
+    def __str__(self):
+        return str(self.id)
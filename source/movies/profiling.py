@@ -0,0 +1,248 @@
+import contextlib
+import contextvars
+import ipaddress
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from config.backends.postgresql_pool.pool import get_pool_stats
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db import connections
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    Представление выполнило больше запросов к БД, чем разрешено MOVIES_QUERY_BUDGETS.
+    """
+
+
+@dataclass
+class RequestProfile:
+    started: float = field(default_factory=time.perf_counter)
+    queries: int = 0
+    sql_seconds: float = 0
+    serialization_seconds: float = 0
+
+    def get_server_timing(self) -> str:
+        total = time.perf_counter() - self.started
+        return ', '.join(
+            [
+                f'db;dur={self.sql_seconds * 1000:.2f};desc="{self.queries} queries"',
+                f'serialize;dur={self.serialization_seconds * 1000:.2f}',
+                f'total;dur={total * 1000:.2f}',
+            ]
+        )
+
+    def __call__(self, execute, sql, params, many, context):
+        """
+        Обертка выполнения запросов (connection.execute_wrapper), считающая запросы и их время.
+        """
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_seconds += time.perf_counter() - started
+
+
+_profile: contextvars.ContextVar[RequestProfile | None] = contextvars.ContextVar(
+    'movies_request_profile', default=None
+)
+
+
+@contextlib.contextmanager
+def serialization_timer():
+    """
+    Добавляет время выполнения блока к времени сериализации текущего запроса.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if (profile := _profile.get()) is not None:
+            profile.serialization_seconds += time.perf_counter() - started
+
+
+@dataclass
+class ViewMetrics:
+    requests: int = 0
+    queries: int = 0
+    sql_seconds: float = 0
+    serialization_seconds: float = 0
+    response_bytes: int = 0
+    budget_exceeded: int = 0
+
+
+class MetricsRegistry:
+    """
+    Накопленные метрики представлений в памяти процесса.
+    Под несколькими воркерами каждый процесс отдает свои значения,
+    поэтому при сборе их нужно суммировать по экземплярам.
+    """
+
+    def __init__(self):
+        self.views: dict[str, ViewMetrics] = {}
+        self.lock = threading.Lock()
+
+    def record(self, view: str, profile: RequestProfile, response_bytes: int):
+        with self.lock:
+            metrics = self.views.setdefault(view, ViewMetrics())
+            metrics.requests += 1
+            metrics.queries += profile.queries
+            metrics.sql_seconds += profile.sql_seconds
+            metrics.serialization_seconds += profile.serialization_seconds
+            metrics.response_bytes += response_bytes
+
+    def record_budget_exceeded(self, view: str):
+        with self.lock:
+            self.views.setdefault(view, ViewMetrics()).budget_exceeded += 1
+
+    def render(self) -> str:
+        """
+        Возвращает метрики в текстовом формате Prometheus.
+        """
+        with self.lock:
+            views = {view: vars(metrics).copy() for view, metrics in self.views.items()}
+
+        lines = []
+        for name, kind in METRICS:
+            lines.append(f'# TYPE movies_view_{name}_total {kind}')
+            lines.extend(
+                f'movies_view_{name}_total{{view="{view}"}} {values[name]}'
+                for view, values in sorted(views.items())
+            )
+        lines.extend(render_pool_stats())
+        return '\n'.join(lines) + '\n'
+
+
+METRICS = (
+    ('requests', 'counter'),
+    ('queries', 'counter'),
+    ('sql_seconds', 'counter'),
+    ('serialization_seconds', 'counter'),
+    ('response_bytes', 'counter'),
+    ('budget_exceeded', 'counter'),
+)
+
+registry = MetricsRegistry()
+
+
+def render_pool_stats() -> list[str]:
+    """
+    Возвращает метрики пулов соединений (DB_CONNECTION_MODE=pool) в формате Prometheus.
+    """
+    lines = []
+    for alias, stats in get_pool_stats().items():
+        lines.extend(
+            f'movies_db_pool_{key}{{alias="{alias}"}} {value}'
+            for key, value in stats.items()
+        )
+    return lines
+
+
+def get_view_name(request: HttpRequest) -> str:
+    match = request.resolver_match
+    if match is None:
+        return 'unresolved'
+    view_class = getattr(match.func, 'view_class', None)
+    return (view_class or match.func).__name__
+
+
+class ProfilingMiddleware:
+    """
+    Замеряет для каждого запроса количество и время SQL-запросов, время сериализации
+    и размер ответа. Отдает их в заголовке Server-Timing, копит по представлениям
+    для /metrics и проверяет бюджет запросов из MOVIES_QUERY_BUDGETS.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    async def call_async(self, request: HttpRequest):
+        profile = RequestProfile()
+        with self.profiling(profile):
+            response = await self.get_response(request)
+        return self.process_response(request, response, profile)
+
+    @contextlib.contextmanager
+    def profiling(self, profile: RequestProfile):
+        token = _profile.set(profile)
+        try:
+            with contextlib.ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile))
+                yield
+        finally:
+            _profile.reset(token)
+
+    def process_response(
+        self, request: HttpRequest, response: HttpResponse, profile: RequestProfile
+    ) -> HttpResponse:
+        view = get_view_name(request)
+        if settings.MOVIES_PROFILING_SERVER_TIMING:
+            response['Server-Timing'] = profile.get_server_timing()
+        # Размер потокового ответа до его отправки неизвестен.
+        size = (
+            0 if isinstance(response, StreamingHttpResponse) else len(response.content)
+        )
+        registry.record(view, profile, size)
+        check_budget(view, profile.queries)
+        return response
+
+    def __call__(self, request: HttpRequest):
+        if iscoroutinefunction(self):
+            return self.call_async(request)
+        profile = RequestProfile()
+        with self.profiling(profile):
+            response = self.get_response(request)
+        return self.process_response(request, response, profile)
+
+
+def check_budget(view: str, queries: int):
+    """
+    Сообщает о превышении бюджета запросов представлением: пишет предупреждение в лог,
+    а при MOVIES_QUERY_BUDGET_MODE='raise' еще и выбрасывает исключение.
+    """
+    budget = settings.MOVIES_QUERY_BUDGETS.get(view)
+    if budget is None or queries <= budget:
+        return
+    registry.record_budget_exceeded(view)
+    message = f'{view} executed {queries} queries, budget is {budget}.'
+    if settings.MOVIES_QUERY_BUDGET_MODE == 'raise':
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+def is_metrics_client(request: HttpRequest) -> bool:
+    """
+    Метрики доступны персоналу и клиентам из внутренних сетей MOVIES_METRICS_ALLOWED_NETWORKS.
+    """
+    if getattr(request, 'user', None) is not None and request.user.is_staff:
+        return True
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    return any(
+        address in ipaddress.ip_network(network.strip())
+        for network in settings.MOVIES_METRICS_ALLOWED_NETWORKS
+    )
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    if not is_metrics_client(request):
+        raise PermissionDenied
+    return HttpResponse(
+        registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
@@ -0,0 +1,104 @@
+import datetime
+from typing import Iterable
+
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Q
+from movies.api.v1.conditional import mark_deleted
+from movies.api.v1.views import MoviesApiMixin
+from movies.models import Filmwork, FilmworkReadModel, GenreFilmwork, PersonFilmwork
+
+
+def get_changed_film_ids(since: datetime.datetime) -> set:
+    """
+    Возвращает ID фильмов, у которых после since изменилась сама запись,
+    связи с жанрами и участниками или связанные жанры и участники.
+    """
+    film_ids = set(
+        Filmwork.objects.filter(modified__gt=since).values_list('id', flat=True)
+    )
+    film_ids.update(
+        GenreFilmwork.objects.filter(
+            Q(modified__gt=since) | Q(genre__modified__gt=since)
+        ).values_list('film_work_id', flat=True)
+    )
+    film_ids.update(
+        PersonFilmwork.objects.filter(
+            Q(modified__gt=since) | Q(person__modified__gt=since)
+        ).values_list('film_work_id', flat=True)
+    )
+    return film_ids
+
+
+def get_watermark() -> datetime.datetime | None:
+    """
+    Возвращает время последнего обновления витрины.
+    """
+    return (
+        FilmworkReadModel.objects.order_by('-refreshed_at')
+        .values_list('refreshed_at', flat=True)
+        .first()
+    )
+
+
+def refresh_films(film_ids: Iterable | None = None) -> int:
+    """
+    Пересобирает строки витрины одним запросом INSERT ... SELECT ... ON CONFLICT.
+    Если film_ids не переданы, пересобираются все фильмы.
+    """
+    query_set = Filmwork.objects.all()
+    if film_ids is not None:
+        query_set = query_set.filter(id__in=list(film_ids))
+    select_sql, params = (
+        MoviesApiMixin(kwargs={}).annotate_with_joins(query_set).query.sql_with_params()
+    )
+
+    quote_name = connection.ops.quote_name
+    columns = ', '.join(
+        quote_name(column) for column in MoviesApiMixin.read_model_fields
+    )
+    updates = ', '.join(
+        f'{quote_name(column)} = EXCLUDED.{quote_name(column)}'
+        for column in (*MoviesApiMixin.read_model_fields, 'refreshed_at')
+        if column != 'id'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {quote_name(FilmworkReadModel._meta.db_table)} ({columns}, refreshed_at) '
+            f'SELECT {columns}, now() FROM ({select_sql}) AS films '
+            f'ON CONFLICT (id) DO UPDATE SET {updates}',
+            params,
+        )
+        return cursor.rowcount
+
+
+def delete_orphans() -> int:
+    """
+    Удаляет из витрины фильмы, которых больше нет в film_work.
+    """
+    deleted, _ = FilmworkReadModel.objects.filter(
+        ~Exists(Filmwork.objects.filter(id=OuterRef('id')))
+    ).delete()
+    if deleted:
+        mark_deleted(FilmworkReadModel)
+    return deleted
+
+
+@transaction.atomic
+def refresh_all() -> tuple[int, int]:
+    """
+    Полностью пересобирает витрину.
+    """
+    return refresh_films(), delete_orphans()
+
+
+@transaction.atomic
+def refresh_changed(since: datetime.datetime, batch_size: int) -> tuple[int, int]:
+    """
+    Пересобирает только фильмы, изменившиеся после since, пачками по batch_size.
+    """
+    film_ids = list(get_changed_film_ids(since))
+    refreshed = 0
+    for start in range(0, len(film_ids), batch_size):
+        end = start + batch_size
+        refreshed += refresh_films(film_ids[start:end])
+    return refreshed, delete_orphans()
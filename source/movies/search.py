@@ -0,0 +1,35 @@
+from django.contrib.postgres.search import SearchQuery
+from django.db.models.query import QuerySet
+
+from movies import models
+
+
+def search_films(query_set: QuerySet, query: str) -> QuerySet:
+    """
+    Оставляет фильмы, название или описание которых соответствует полнотекстовому запросу.
+    Запрос разбирается как в поисковых системах: слова, "фразы", OR и -исключения.
+    """
+    return query_set.alias(search=models.SEARCH_VECTOR).filter(
+        search=SearchQuery(query, config=models.SEARCH_CONFIG, search_type='websearch')
+    )
+
+
+def filter_by_genre(query_set: QuerySet, genre: str) -> QuerySet:
+    """
+    Оставляет фильмы с жанром genre (без учета регистра).
+    Фильтр строится полусоединением по ID фильма, а не соединением со связями,
+    чтобы не менять состав агрегатов с жанрами и участниками в запросе.
+    ID фильмов жанра читаются из индекса genre_film_work_genre_idx.
+    """
+    film_ids = models.GenreFilmwork.objects.filter(genre__name__iexact=genre)
+    return query_set.filter(id__in=film_ids.values('film_work_id'))
+
+
+def filter_by_person(query_set: QuerySet, name: str) -> QuerySet:
+    """
+    Оставляет фильмы с участником, в имени которого есть подстрока name (без учета регистра).
+    Поиск по подстроке выполняется через триграммный индекс person_full_name_trgm_idx,
+    а ID фильмов найденных участников читаются из индекса person_film_work_person_idx.
+    """
+    film_ids = models.PersonFilmwork.objects.filter(person__full_name__icontains=name)
+    return query_set.filter(id__in=film_ids.values('film_work_id'))
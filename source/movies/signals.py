@@ -0,0 +1,146 @@
+from config.routers import mark_written
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from movies.api.v1.cache import evict_details
+from movies.api.v1.changes import add_tombstones
+from movies.api.v1.conditional import mark_deleted
+from movies.api.v1.counts import invalidate_counts
+from movies.api.v1.http_cache import purge_films
+from movies.models import Filmwork, Genre, GenreFilmwork, Person, PersonFilmwork
+
+
+@receiver([post_save, post_delete], sender=Filmwork)
+@receiver([post_save, post_delete], sender=GenreFilmwork)
+@receiver([post_save, post_delete], sender=PersonFilmwork)
+@receiver([post_save, post_delete], sender=Genre)
+@receiver([post_save, post_delete], sender=Person)
+def invalidate_filmwork_counts(sender, **kwargs):
+    """
+    Сбрасывает закэшированные количества фильмов при добавлении, изменении и удалении фильма.
+    От связей, названий жанров и имен участников зависят количества с фильтрами genre и person.
+    """
+    invalidate_counts_on_commit()
+
+
+@receiver(post_delete, sender=Filmwork)
+def mark_filmwork_deleted(sender, instance, **kwargs):
+    mark_deleted(Filmwork)
+    add_tombstones([instance.pk])
+
+
+class FilmworkChanges:
+    """
+    Фильмы, затронутые текущей транзакцией. Обрабатываются одним вызовом после ее фиксации,
+    сколько бы сигналов ни пришло до этого: каскадное удаление фильма или участника
+    присылает post_delete для каждой связи.
+    """
+
+    def __init__(self):
+        self.touched = set()
+        self.evicted = set()
+        self.counts_changed = False
+
+    def __call__(self):
+        # Окно чтения с основной базы открывается до сброса кэшей, чтобы их
+        # не заполнили данные отстающей реплики.
+        mark_written()
+        if self.touched:
+            Filmwork.objects.filter(pk__in=self.touched).update(modified=timezone.now())
+        if self.counts_changed:
+            invalidate_counts()
+        evict_details(self.evicted)
+        purge_films(self.evicted)
+
+
+def get_filmwork_changes(connection) -> FilmworkChanges:
+    """
+    Возвращает изменения текущей транзакции, при первом обращении в ней
+    регистрируя их обработку после фиксации.
+    """
+    changes = getattr(connection, 'movies_filmwork_changes', None)
+    # После фиксации или отката (в том числе точки сохранения, в которой изменения
+    # были зарегистрированы) обработчика уже нет в run_on_commit, и нужен новый.
+    if changes is None or not any(
+        callback is changes for _, callback, _ in connection.run_on_commit
+    ):
+        changes = FilmworkChanges()
+        connection.movies_filmwork_changes = changes
+        transaction.on_commit(changes)
+    return changes
+
+
+def on_filmwork_changes(touched=(), evicted=(), counts_changed=False):
+    connection = transaction.get_connection()
+    if connection.in_atomic_block:
+        changes = get_filmwork_changes(connection)
+    else:
+        changes = FilmworkChanges()
+    changes.touched.update(touched)
+    changes.evicted.update(evicted)
+    changes.counts_changed |= counts_changed
+    # Вне транзакции изменения обрабатываются сразу.
+    if not connection.in_atomic_block:
+        changes()
+
+
+@receiver(post_delete, sender=GenreFilmwork)
+@receiver(post_delete, sender=PersonFilmwork)
+def touch_filmwork(sender, instance, **kwargs):
+    """
+    Удаление связи не оставляет следа в колонках modified, поэтому изменение отмечается у фильма.
+    По нему инкрементально обновляется витрина FilmworkReadModel. Время изменения
+    проставляется одним запросом после фиксации транзакции для всех ее фильмов.
+    """
+    on_filmwork_changes(touched=[instance.film_work_id])
+
+
+def invalidate_counts_on_commit():
+    """
+    Сбрасывает закэшированные количества фильмов после фиксации транзакции:
+    иначе параллельный запрос закэшировал бы под новым поколением ключей количество до изменения.
+    """
+    on_filmwork_changes(counts_changed=True)
+
+
+def evict_details_on_commit(film_ids):
+    """
+    Сбрасывает кэш карточек после фиксации транзакции,
+    чтобы параллельный запрос не закэшировал данные до изменения.
+    Затем обновляет ответы в кэше nginx: он запрашивает карточки уже мимо кэша Django.
+    """
+    on_filmwork_changes(evicted=film_ids)
+
+
+@receiver([post_save, post_delete], sender=Filmwork)
+def evict_filmwork_detail(sender, instance, **kwargs):
+    evict_details_on_commit([instance.pk])
+
+
+@receiver([post_save, post_delete], sender=GenreFilmwork)
+@receiver([post_save, post_delete], sender=PersonFilmwork)
+def evict_linked_filmwork_detail(sender, instance, **kwargs):
+    evict_details_on_commit([instance.film_work_id])
+
+
+@receiver(post_save, sender=Genre)
+def evict_genre_filmworks_details(sender, instance, **kwargs):
+    """
+    При удалении жанра каскадно удаляются его связи, и кэш сбрасывается их сигналами.
+    """
+    film_ids = GenreFilmwork.objects.filter(genre=instance).values_list(
+        'film_work_id', flat=True
+    )
+    evict_details_on_commit(list(film_ids))
+
+
+@receiver(post_save, sender=Person)
+def evict_person_filmworks_details(sender, instance, **kwargs):
+    """
+    При удалении участника каскадно удаляются его связи, и кэш сбрасывается их сигналами.
+    """
+    film_ids = PersonFilmwork.objects.filter(person=instance).values_list(
+        'film_work_id', flat=True
+    )
+    evict_details_on_commit(list(film_ids))
@@ -0,0 +1,31 @@
+"""
+Разбор водяного знака ленты изменений.
+"""
+import datetime
+import uuid
+
+import pytest
+from movies.api.v1.changes import make_watermark, parse_watermark
+from movies.api.v1.pagination import encode_token
+
+
+def test_watermark_round_trip():
+    moment = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+    film_id = uuid.uuid4()
+
+    assert parse_watermark(None, make_watermark(moment, film_id)) == (moment, film_id)
+
+
+@pytest.mark.parametrize(
+    'payload',
+    [
+        {'modified': '2020-01-01T00:00:00', 'id': 5},
+        {'modified': '2020-01-01T00:00:00', 'id': ['x']},
+        {'modified': 5, 'id': str(uuid.uuid4())},
+        {'modified': '2020-01-01T00:00:00'},
+        ['2020-01-01T00:00:00'],
+    ],
+)
+def test_malformed_watermark_is_rejected(payload):
+    with pytest.raises(ValueError, match='Invalid watermark'):
+        parse_watermark(None, encode_token(payload))
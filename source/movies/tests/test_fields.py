@@ -0,0 +1,69 @@
+"""
+SQL запросов API для разных наборов полей в параметре fields.
+"""
+import itertools
+import uuid
+
+import pytest
+from django.test import RequestFactory, override_settings
+from movies.api.v1.views import MoviesDetailApi, MoviesListApi
+
+RELATIONS = ('genres', 'actors', 'directors', 'writers')
+RELATION_COMBINATIONS = [
+    combination
+    for size in range(len(RELATIONS) + 1)
+    for combination in itertools.combinations(RELATIONS, size)
+]
+# Признаки агрегации связей в SQL каждого способа построения запроса.
+RELATION_MARKERS = {'subquery': 'ARRAY(SELECT', 'join': 'JSONB_OBJECT_AGG('}
+
+
+def get_sql(view_class, path: str, fields: str, engine: str, **kwargs) -> str:
+    view = view_class()
+    view.setup(RequestFactory().get(path, {'fields': fields}), **kwargs)
+    assert view.validate_params(view.request) is None
+    with override_settings(MOVIES_API_QUERY_ENGINE=engine):
+        return str(view.get_queryset().query)
+
+
+@pytest.mark.parametrize('engine', ['subquery', 'join'])
+@pytest.mark.parametrize('relations', RELATION_COMBINATIONS)
+def test_list_aggregates_only_requested_relations(engine, relations):
+    sql = get_sql(
+        MoviesListApi, '/api/v1/movies/', ','.join(('title', *relations)), engine
+    )
+
+    assert sql.count(RELATION_MARKERS[engine]) == len(relations)
+    for relation in RELATIONS:
+        assert (f'AS "{relation}"' in sql) == (relation in relations)
+    if engine == 'join':
+        assert ('GROUP BY' in sql) == bool(relations)
+
+
+@pytest.mark.parametrize('engine', ['subquery', 'join', 'read_model'])
+@pytest.mark.parametrize(
+    ('view_class', 'path', 'kwargs'),
+    [
+        (MoviesListApi, '/api/v1/movies/', {}),
+        (MoviesDetailApi, '/api/v1/movies/id/', {'pk': uuid.uuid4()}),
+    ],
+)
+def test_without_relations_reads_only_films(engine, view_class, path, kwargs):
+    """
+    Без жанров и участников запрос читает только таблицу фильмов (или витрину)
+    и выполняется одним проходом по ней или ее индексу.
+    """
+    sql = get_sql(view_class, path, 'id,title,rating', engine, **kwargs)
+
+    assert 'ARRAY(' not in sql
+    assert 'JSONB_OBJECT_AGG(' not in sql
+    assert 'JOIN' not in sql
+    assert 'GROUP BY' not in sql
+
+
+@pytest.mark.parametrize('engine', ['subquery', 'join', 'read_model'])
+def test_all_fields_by_default(engine):
+    sql = get_sql(MoviesListApi, '/api/v1/movies/', '', engine)
+
+    for relation in RELATIONS:
+        assert f'"{relation}"' in sql
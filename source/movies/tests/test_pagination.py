@@ -0,0 +1,56 @@
+"""
+Разбор курсора постраничной навигации списка фильмов.
+"""
+import json
+
+import pytest
+from django.test import RequestFactory
+from movies.api.v1.pagination import encode_token
+from movies.api.v1.views import MoviesListApi
+
+
+def validate(cursor: str, sort: str = 'creation_date'):
+    view = MoviesListApi()
+    view.setup(
+        RequestFactory().get('/api/v1/movies/', {'cursor': cursor, 'sort': sort})
+    )
+    return view.validate_params(view.request)
+
+
+def test_valid_cursor_is_accepted():
+    cursor = encode_token(
+        {
+            'key': ['2020-01-01', '00000000-0000-0000-0000-000000000001'],
+            'backwards': False,
+            'ordering': ['creation_date', 'id'],
+        }
+    )
+
+    assert validate(cursor) is None
+
+
+@pytest.mark.parametrize(
+    ('sort', 'key'),
+    [
+        ('creation_date', [1, 'x']),
+        ('creation_date', [['2020-01-01'], 'x']),
+        ('creation_date', [{'date': '2020-01-01'}, 'x']),
+        ('creation_date', ['2020-01-01', []]),
+        ('rating', [[1], 'x']),
+        ('title', ['title', ['x']]),
+    ],
+)
+def test_malformed_key_gives_bad_request(sort, key):
+    cursor = encode_token({'key': key, 'backwards': False, 'ordering': [sort, 'id']})
+
+    response = validate(cursor, sort)
+
+    assert response.status_code == 400
+    assert 'cursor' in json.loads(response.content)['detail']
+
+
+@pytest.mark.parametrize(
+    'cursor', ['not-base64!', encode_token([1, 2]), encode_token({'key': 1})]
+)
+def test_malformed_cursor_gives_bad_request(cursor):
+    assert validate(cursor).status_code == 400